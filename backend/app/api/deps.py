@@ -6,8 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_async_session
+from app.core.principal_cache import Principal, principal_cache
 from app.core.security import decode_token
 from app.models.user import User
+from app.services.token_revocation import revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -15,10 +17,25 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
 
 
+async def load_principal(db: AsyncSession, user_id: int) -> Principal | None:
+    """Get a principal from cache, falling back to the database."""
+    user = principal_cache.get(user_id)
+    if user is None:
+        result = await db.execute(
+            select(User.id, User.email, User.is_admin, User.is_active).where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        user = Principal(id=row.id, email=row.email, is_admin=row.is_admin, is_active=row.is_active)
+        principal_cache.put(user)
+    return user
+
+
 async def get_current_user(
     db: AsyncSessionDep,
     token: Annotated[str, Depends(oauth2_scheme)]
-) -> User:
+) -> Principal:
     """Get the current authenticated user."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,10 +55,12 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    # Logged out everywhere after this token was issued (in-memory check)
+    await revocations.ensure_loaded()
+    if revocations.revoked_before(int(user_id), payload.get("iat")):
+        raise credentials_exception
     
+    user = await load_principal(db, int(user_id))
     if user is None:
         raise credentials_exception
     
@@ -55,8 +74,8 @@ async def get_current_user(
 
 
 async def get_current_admin(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     """Get the current authenticated admin user."""
     if not current_user.is_admin:
         raise HTTPException(
@@ -67,6 +86,6 @@ async def get_current_admin(
 
 
 # Type aliases for dependency injection
-CurrentUser = Annotated[User, Depends(get_current_user)]
-CurrentAdmin = Annotated[User, Depends(get_current_admin)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+CurrentAdmin = Annotated[Principal, Depends(get_current_admin)]
 
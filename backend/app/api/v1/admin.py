@@ -1,11 +1,21 @@
+import os
+from datetime import date, datetime
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy import select, func
+from typing import Any
+from fastapi import APIRouter, Body, File, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from sqlalchemy import select, tuple_
 
 from app.api.deps import AsyncSessionDep, CurrentAdmin
+from app.api.v1.test import load_question_list
+from app.core.config import settings as app_settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principal_cache import principal_cache
+from app.core.responses import json_response
+from app.core.response_cache import PRIZES, TEST_QUESTIONS, response_cache
 from app.models.user import User
-from app.models.user_progress import UserProgress
 from app.models.application import Application
 from app.models.prize import Prize
 from app.models.test_question import TestQuestion
@@ -14,14 +24,24 @@ from app.schemas.admin import (
     AnalyticsResponse, 
     EventSettingsResponse, 
     EventSettingsUpdate,
-    UserAnalytics
+    UserAnalytics,
+    UserStatusUpdate
 )
 from app.schemas.prize import PrizeCreate, PrizeUpdate, PrizeResponse
 from app.schemas.test import TestQuestionCreate, TestQuestionUpdate, TestQuestionResponse
 from app.schemas.application import ApplicationWithUser
+from app.schemas.bulk import BulkImportResponse
+from app.schemas.pagination import Page
+from app.schemas.points import PointsLedgerEntryResponse
+from app.schemas.user import UserResponse
+from app.services import admin_feed, analytics, bulk_import, events, exports, points_ledger, prize_stock
+from app.services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+user_page_adapter = TypeAdapter(Page[UserAnalytics])
+application_page_adapter = TypeAdapter(Page[ApplicationWithUser])
+
 
 # ============== Analytics ==============
 
@@ -30,85 +50,220 @@ async def get_analytics(
     current_admin: CurrentAdmin,
     db: AsyncSessionDep
 ) -> AnalyticsResponse:
-    """Get analytics data."""
-    # Count registrations
-    result = await db.execute(select(func.count(User.id)).where(User.is_admin == False))
-    registrations = result.scalar()
-    
-    # Count completed tests
-    result = await db.execute(
-        select(func.count(UserProgress.id)).where(UserProgress.completed_test == True)
-    )
-    tests_completed = result.scalar()
-    
-    # Count completed games
-    result = await db.execute(
-        select(func.count(UserProgress.id)).where(UserProgress.completed_game == True)
-    )
-    games_completed = result.scalar()
+    """Get analytics data from the incrementally maintained counters."""
+    counters = await analytics.read_counters(db)
+    return AnalyticsResponse(**counters)
+
+
+@router.get("/analytics/check", response_model=dict)
+async def check_analytics(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep
+) -> dict:
+    """Compare analytics counters with real counts (full scan)."""
+    return await analytics.check(db)
+
+
+@router.post("/analytics/rebuild", response_model=AnalyticsResponse)
+async def rebuild_analytics(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep
+) -> AnalyticsResponse:
+    """Rebuild analytics counters from scratch."""
+    counters = await analytics.rebuild(db)
+    return AnalyticsResponse(**counters)
+
+
+@router.get("/stream")
+async def stream_dashboard(
+    current_admin: CurrentAdmin,
+    last_event_id: str | None = Header(None)
+) -> StreamingResponse:
+    """Live dashboard updates as Server-Sent Events.
     
-    # Count applications
-    result = await db.execute(select(func.count(Application.id)))
-    applications = result.scalar()
+    Starts with a `snapshot` ({"analytics": {...}}), then sends `analytics`
+    (counter deltas), `analytics_totals`, `user`, `application` and
+    `prize_claimed` events. Rows have the same shape as in the list endpoints.
+    """
+    stream = admin_feed.admin_hub.subscribe(admin_feed.snapshot, last_event_id)
+    if stream is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections",
+            headers={"Retry-After": "5"}
+        )
     
-    return AnalyticsResponse(
-        registrations=registrations or 0,
-        tests_completed=tests_completed or 0,
-        games_completed=games_completed or 0,
-        applications=applications or 0
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable response buffering in nginx
+            "X-Accel-Buffering": "no",
+        }
     )
 
 
-@router.get("/users", response_model=list[UserAnalytics])
+@router.get("/users", response_model=Page[UserAnalytics])
 async def get_users(
     current_admin: CurrentAdmin,
-    db: AsyncSessionDep
-) -> list[UserAnalytics]:
-    """Get list of registered users."""
-    result = await db.execute(
-        select(User)
+    db: AsyncSessionDep,
+    cursor: str | None = None,
+    limit: int = Query(app_settings.ADMIN_PAGE_SIZE, ge=1, le=app_settings.ADMIN_PAGE_SIZE_MAX)
+) -> Response:
+    """Get a page of registered users, newest first."""
+    query = (
+        select(User.id, User.email, User.created_at)
         .where(User.is_admin == False)
-        .order_by(User.created_at.desc())
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(limit + 1)
     )
-    users = result.scalars().all()
+    if cursor:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*decode_cursor(cursor)))
+    
+    result = await db.execute(query)
+    rows = result.all()
+    
+    # One extra row tells whether another page exists
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
     
-    return [
-        UserAnalytics(
-            email=user.email,
-            registered_at=user.created_at.isoformat()
+    page = user_page_adapter.validate_python({
+        "items": [
+            {"email": row.email, "registered_at": row.created_at.isoformat()}
+            for row in rows
+        ],
+        "next_cursor": next_cursor
+    })
+    return json_response(user_page_adapter, page)
+
+
+@router.get("/users/{user_id}/points/history", response_model=Page[PointsLedgerEntryResponse])
+async def get_user_points_history(
+    user_id: int,
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep,
+    cursor: str | None = None,
+    limit: int = Query(app_settings.POINTS_HISTORY_PAGE_SIZE, ge=1, le=app_settings.POINTS_HISTORY_PAGE_SIZE_MAX)
+) -> Page[PointsLedgerEntryResponse]:
+    """Get a page of a user's points history, newest first."""
+    return await points_ledger.history(db, user_id, cursor, limit)
+
+
+@router.patch("/users/{user_id}", response_model=UserResponse)
+async def update_user_status(
+    user_id: int,
+    status_data: UserStatusUpdate,
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep
+) -> UserResponse:
+    """Activate/deactivate a user or change admin rights."""
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
-        for user in users
-    ]
+    
+    # Registrations count non-admin users only
+    role_changed = status_data.is_admin is not None and status_data.is_admin != user.is_admin
+    if role_changed:
+        await analytics.increment(db, analytics.REGISTRATIONS, -1 if status_data.is_admin else 1)
+    
+    # Update fields
+    update_data = status_data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(user, field, value)
+    
+    await db.commit()
+    await db.refresh(user)
+    
+    # Drop cached principal so the new status applies on the next request
+    principal_cache.invalidate(user.id)
+    if role_changed:
+        await leaderboard.refresh_user(db, user.id)
+        events.emit(events.USER_ROLE_CHANGED, {"id": user.id, "is_admin": user.is_admin})
+    
+    return user
 
 
-@router.get("/applications", response_model=list[ApplicationWithUser])
+@router.get("/applications", response_model=Page[ApplicationWithUser])
 async def get_applications(
     current_admin: CurrentAdmin,
-    db: AsyncSessionDep
-) -> list[ApplicationWithUser]:
-    """Get all applications."""
-    result = await db.execute(
-        select(Application, User)
+    db: AsyncSessionDep,
+    cursor: str | None = None,
+    limit: int = Query(app_settings.ADMIN_PAGE_SIZE, ge=1, le=app_settings.ADMIN_PAGE_SIZE_MAX)
+) -> Response:
+    """Get a page of applications, newest first."""
+    # Plain column rows instead of ORM objects: no identity map, validated once
+    query = (
+        select(*Application.__table__.columns, User.email.label("user_email"))
         .join(User, Application.user_id == User.id)
-        .order_by(Application.created_at.desc())
+        .order_by(Application.created_at.desc(), Application.id.desc())
+        .limit(limit + 1)
     )
+    if cursor:
+        query = query.where(
+            tuple_(Application.created_at, Application.id) < tuple_(*decode_cursor(cursor))
+        )
+    
+    result = await db.execute(query)
     rows = result.all()
     
-    return [
-        ApplicationWithUser(
-            id=app.id,
-            user_id=app.user_id,
-            full_name=app.full_name,
-            email=app.email,
-            phone=app.phone,
-            direction=app.direction,
-            motivation=app.motivation,
-            resume_path=app.resume_path,
-            created_at=app.created_at,
-            user_email=user.email
+    # One extra row tells whether another page exists
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    page = application_page_adapter.validate_python({
+        "items": [row._asdict() for row in rows],
+        "next_cursor": next_cursor
+    })
+    return json_response(application_page_adapter, page)
+
+
+@router.get("/applications/export")
+async def export_applications(
+    current_admin: CurrentAdmin,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    direction: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None
+):
+    """Export applications as CSV (streamed) or XLSX."""
+    if direction is not None and direction not in ["developer", "designer"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid direction. Must be 'developer' or 'designer'"
         )
-        for app, user in rows
-    ]
+    
+    query = exports.build_applications_query(direction, date_from, date_to)
+    filename = f"applications_{datetime.utcnow():%Y%m%d_%H%M%S}.{format}"
+    
+    if format == "xlsx":
+        if not exports.xlsx_available():
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="XLSX export requires openpyxl to be installed"
+            )
+        path = await exports.write_xlsx(query)
+        return FileResponse(
+            path=path,
+            filename=filename,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            background=BackgroundTask(os.unlink, path)
+        )
+    
+    return StreamingResponse(
+        exports.csv_chunks(query),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/applications/{application_id}/resume")
@@ -206,11 +361,9 @@ async def update_settings(
 async def admin_get_prizes(
     current_admin: CurrentAdmin,
     db: AsyncSessionDep
-) -> list[PrizeResponse]:
-    """Get all prizes for admin."""
-    result = await db.execute(select(Prize).order_by(Prize.points))
-    prizes = result.scalars().all()
-    return prizes
+) -> Response:
+    """Get all prizes for admin (read fresh, bypassing the response cache)."""
+    return Response(content=await prize_stock.load_prize_list(db), media_type="application/json")
 
 
 @router.post("/prizes", response_model=PrizeResponse, status_code=status.HTTP_201_CREATED)
@@ -223,7 +376,9 @@ async def create_prize(
     prize = Prize(**prize_data.model_dump())
     db.add(prize)
     await db.commit()
+    response_cache.invalidate(PRIZES)
     await db.refresh(prize)
+    events.emit(events.PRIZE_UPDATED, {"prize_id": prize.id, "quantity": prize.quantity})
     return prize
 
 
@@ -250,7 +405,9 @@ async def update_prize(
         setattr(prize, field, value)
     
     await db.commit()
+    response_cache.invalidate(PRIZES)
     await db.refresh(prize)
+    events.emit(events.PRIZE_UPDATED, {"prize_id": prize.id, "quantity": prize.quantity})
     return prize
 
 
@@ -272,21 +429,46 @@ async def delete_prize(
     
     await db.delete(prize)
     await db.commit()
+    response_cache.invalidate(PRIZES)
+    events.emit(events.PRIZE_REMOVED, {"prize_id": prize_id})
     
     return {"message": "Prize deleted successfully"}
 
 
+@router.post("/prizes/bulk", response_model=BulkImportResponse)
+async def bulk_upsert_prizes(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep,
+    rows: list[dict[str, Any]] = Body(...)
+):
+    """Create or update prizes by name in one transaction (all or nothing)."""
+    result = await _apply_bulk(db, bulk_import.upsert_prizes, rows, PRIZES)
+    await prize_stock.sync_stock()
+    return result
+
+
+@router.post("/prizes/bulk/csv", response_model=BulkImportResponse)
+async def bulk_upsert_prizes_csv(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep,
+    file: UploadFile = File(...)
+):
+    """Same as /prizes/bulk from a CSV file (name, points, quantity, description)."""
+    rows = await _read_bulk_csv(file, bulk_import.parse_prizes_csv)
+    result = await _apply_bulk(db, bulk_import.upsert_prizes, rows, PRIZES)
+    await prize_stock.sync_stock()
+    return result
+
+
 # ============== Test Questions Management ==============
 
 @router.get("/questions", response_model=list[TestQuestionResponse])
 async def admin_get_questions(
     current_admin: CurrentAdmin,
     db: AsyncSessionDep
-) -> list[TestQuestionResponse]:
-    """Get all test questions for admin."""
-    result = await db.execute(select(TestQuestion).order_by(TestQuestion.order))
-    questions = result.scalars().all()
-    return questions
+) -> Response:
+    """Get all test questions for admin (read fresh, bypassing the response cache)."""
+    return Response(content=await load_question_list(db), media_type="application/json")
 
 
 @router.post("/questions", response_model=TestQuestionResponse, status_code=status.HTTP_201_CREATED)
@@ -303,6 +485,7 @@ async def create_question(
     )
     db.add(question)
     await db.commit()
+    response_cache.invalidate(TEST_QUESTIONS)
     await db.refresh(question)
     return question
 
@@ -333,6 +516,7 @@ async def update_question(
         question.order = question_data.order
     
     await db.commit()
+    response_cache.invalidate(TEST_QUESTIONS)
     await db.refresh(question)
     return question
 
@@ -355,6 +539,73 @@ async def delete_question(
     
     await db.delete(question)
     await db.commit()
+    response_cache.invalidate(TEST_QUESTIONS)
     
     return {"message": "Question deleted successfully"}
 
+
+@router.post("/questions/bulk", response_model=BulkImportResponse)
+async def bulk_upsert_questions(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep,
+    rows: list[dict[str, Any]] = Body(...)
+):
+    """Create or update test questions by text in one transaction (all or nothing)."""
+    return await _apply_bulk(db, bulk_import.upsert_questions, rows, TEST_QUESTIONS)
+
+
+@router.post("/questions/bulk/csv", response_model=BulkImportResponse)
+async def bulk_upsert_questions_csv(
+    current_admin: CurrentAdmin,
+    db: AsyncSessionDep,
+    file: UploadFile = File(...)
+):
+    """Same as /questions/bulk from a CSV file
+    (question, order, option_1_text, option_1_type, option_2_text, ...)."""
+    rows = await _read_bulk_csv(file, bulk_import.parse_questions_csv)
+    return await _apply_bulk(db, bulk_import.upsert_questions, rows, TEST_QUESTIONS)
+
+
+# ============== Bulk import helpers ==============
+
+async def _read_bulk_csv(file: UploadFile, parse) -> list[dict[str, Any]]:
+    content = await file.read(app_settings.MAX_UPLOAD_SIZE + 1)
+    if len(content) > app_settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Max size: {app_settings.MAX_UPLOAD_SIZE // (1024*1024)}MB"
+        )
+    try:
+        return parse(content)
+    except bulk_import.BulkImportError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+async def _apply_bulk(db, upsert, rows: list[dict[str, Any]], cache_key: str):
+    """Run a bulk upsert; 422 with per-row results if any row is invalid."""
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No rows to import"
+        )
+    if len(rows) > app_settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many rows. Max: {app_settings.BULK_IMPORT_MAX_ROWS}"
+        )
+    
+    try:
+        result = await upsert(db, rows)
+    except bulk_import.BulkImportError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if result.invalid:
+        await db.rollback()
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content=result.model_dump()
+        )
+    
+    await db.commit()
+    response_cache.invalidate(cache_key)
+    return result
+
@@ -1,15 +1,18 @@
-import os
 import uuid
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import AsyncSessionDep, CurrentUser
 from app.core.config import settings
 from app.models.application import Application
-from app.models.user_progress import UserProgress
 from app.schemas.application import ApplicationResponse
+from app.services import admin_feed, analytics, events, points_ledger
+from app.services import progress as progress_service
+from app.services.leaderboard import leaderboard
+from app.services.uploads import UploadTooLarge, stage_upload
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -56,6 +59,7 @@ async def submit_application(
         )
     
     resume_path = None
+    staged_resume = None
     
     # Handle resume upload
     if resume:
@@ -67,59 +71,73 @@ async def submit_application(
                 detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
-        # Check file size
-        content = await resume.read()
-        if len(content) > settings.MAX_UPLOAD_SIZE:
+        # Generate unique filename
+        upload_dir = Path(settings.UPLOAD_DIR)
+        unique_filename = f"{current_user.id}_{uuid.uuid4().hex}{ext}"
+        
+        # Stream to a temp file in chunks, checking the size as we go
+        try:
+            staged_resume = await stage_upload(resume, upload_dir / unique_filename)
+        except UploadTooLarge:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE // (1024*1024)}MB"
             )
         
-        # Save file
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
+        resume_path = str(staged_resume.final_path)
+    
+    try:
+        # Create application
+        application = Application(
+            user_id=current_user.id,
+            full_name=full_name,
+            email=email,
+            phone=phone,
+            direction=direction,
+            motivation=motivation,
+            resume_path=resume_path
+        )
+        db.add(application)
+        try:
+            # The unique user_id rejects a concurrent second application,
+            # so its points can't be awarded twice either
+            await db.flush()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Application already submitted"
+            )
         
-        # Generate unique filename
-        unique_filename = f"{current_user.id}_{uuid.uuid4().hex}{ext}"
-        file_path = upload_dir / unique_filename
+        total_points = await progress_service.award(
+            db,
+            current_user.id,
+            APPLICATION_POINTS,
+            points_ledger.APPLICATION_SUBMITTED,
+            reference=f"application:{application.id}"
+        )
         
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await analytics.increment(db, analytics.APPLICATIONS)
         
-        resume_path = str(file_path)
-    
-    # Create application
-    application = Application(
-        user_id=current_user.id,
-        full_name=full_name,
-        email=email,
-        phone=phone,
-        direction=direction,
-        motivation=motivation,
-        resume_path=resume_path
-    )
-    db.add(application)
-    
-    # Get user progress and add points
-    result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
-    )
-    progress = result.scalar_one_or_none()
-    
-    if not progress:
-        progress = UserProgress(user_id=current_user.id)
-        db.add(progress)
-        await db.flush()
+        # Move the resume into place just before the commit; a crash in
+        # between leaves an orphan file rather than a dangling resume_path
+        if staged_resume:
+            staged_resume.commit()
+        await db.commit()
+    except BaseException:
+        if staged_resume:
+            staged_resume.discard()
+        raise
     
-    progress.points += APPLICATION_POINTS
+    leaderboard.record(current_user, total_points)
     
-    await db.commit()
-    await db.refresh(progress)
+    # created_at was set at flush and the account email is on the principal: no reload
+    events.emit(events.APPLICATION_SUBMITTED, admin_feed.application_payload(application, current_user.email))
     
     return {
         "message": "Application submitted successfully",
         "points_earned": APPLICATION_POINTS,
-        "total_points": progress.points
+        "total_points": total_points
     }
 
 
@@ -1,72 +1,136 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from datetime import datetime, timedelta
 from typing import Annotated
+from uuid import uuid4
 
-from app.api.deps import AsyncSessionDep
+from app.api.deps import AsyncSessionDep, CurrentUser, load_principal
+from app.core import metrics
+from app.core.config import settings
+from app.core.password_hasher import password_hasher, PasswordHasherUnavailable
+from app.core.rate_limit import auth_email_limiter, auth_ip_limiter, retry_after_header
 from app.core.security import (
-    get_password_hash, 
-    verify_password, 
     create_tokens,
     decode_token,
     create_access_token
 )
-from app.models.user import User
-from app.models.user_progress import UserProgress
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import Token, RefreshTokenRequest
+from app.services import analytics, events, registration, token_revocation
+from app.services.leaderboard import leaderboard
+from app.services.token_revocation import revocations
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def service_busy_exception() -> HTTPException:
+    """503 returned when the password hashing pool is saturated."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Service is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+def admit_auth_request(request: Request, email: str) -> None:
+    """Reject auth requests before they queue bcrypt work.
+    
+    503 while the hashing queue is past AUTH_SHED_QUEUE_DEPTH (the
+    server is overloaded, whoever is asking), then 429 once the client
+    IP or the email runs out of tokens (one client retrying too fast).
+    """
+    if password_hasher.queue_depth >= settings.AUTH_SHED_QUEUE_DEPTH:
+        metrics.auth_rejected_total.inc("overload")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is busy, please retry",
+            headers={"Retry-After": retry_after_header(password_hasher.expected_wait())},
+        )
+    
+    client_ip = request.client.host if request.client else "unknown"
+    for reason, limiter, key in (
+        ("ip", auth_ip_limiter, client_ip),
+        ("email", auth_email_limiter, email.strip().lower()),
+    ):
+        retry_after = limiter.take(key)
+        if retry_after:
+            metrics.auth_rejected_total.inc(reason)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please retry later",
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+
+
+def session_expires_at() -> datetime:
+    """When every refresh token issued until now has expired."""
+    return datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password in the worker pool."""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherUnavailable:
+        raise service_busy_exception()
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the worker pool."""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherUnavailable:
+        raise service_busy_exception()
+
+
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(
+    request: Request,
     user_data: UserCreate,
     db: AsyncSessionDep
 ) -> Token:
     """Register a new user."""
-    # Check if user already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    existing_user = result.scalar_one_or_none()
+    admit_auth_request(request, user_data.email)
     
-    if existing_user:
+    # Create the user and its progress row; nothing is inserted if the email is taken
+    hashed_password = await hash_password(user_data.password)
+    created_at = datetime.utcnow()
+    user_id = await registration.create_user(db, user_data.email, hashed_password, created_at)
+    
+    if user_id is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    new_user = User(
-        email=user_data.email,
-        hashed_password=hashed_password,
-        is_admin=False
-    )
-    db.add(new_user)
-    await db.flush()  # Get the user ID
-    
-    # Create user progress
-    user_progress = UserProgress(user_id=new_user.id)
-    db.add(user_progress)
-    
+    await analytics.increment(db, analytics.REGISTRATIONS)
     await db.commit()
-    await db.refresh(new_user)
+    leaderboard.set_points(user_id, 0)
+    events.emit(events.USER_REGISTERED, {
+        "id": user_id,
+        "email": user_data.email,
+        "registered_at": created_at.isoformat(),
+    })
     
     # Return tokens
-    return create_tokens(new_user.id)
+    return create_tokens(user_id)
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: AsyncSessionDep
 ) -> Token:
     """Login user and return tokens."""
+    admit_auth_request(request, form_data.username)
+    
     # Find user by email
-    result = await db.execute(select(User).where(User.email == form_data.username))
+    result = await db.execute(registration.by_email(form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await check_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -84,15 +148,18 @@ async def login(
 
 @router.post("/login/json", response_model=Token)
 async def login_json(
+    request: Request,
     user_data: UserCreate,
     db: AsyncSessionDep
 ) -> Token:
     """Login user with JSON body and return tokens."""
+    admit_auth_request(request, user_data.email)
+    
     # Find user by email
-    result = await db.execute(select(User).where(User.email == user_data.email))
+    result = await db.execute(registration.by_email(user_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not user or not await check_password(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -113,7 +180,11 @@ async def refresh_token(
     token_data: RefreshTokenRequest,
     db: AsyncSessionDep
 ) -> Token:
-    """Refresh access token using refresh token."""
+    """Rotate a refresh token: it is revoked and a new pair is returned.
+    
+    Within REFRESH_REUSE_GRACE a rotated token gets the same new pair
+    again (a retried request); later reuse revokes its whole login session.
+    """
     payload = decode_token(token_data.refresh_token)
     
     if payload is None:
@@ -129,15 +200,28 @@ async def refresh_token(
         )
     
     user_id = payload.get("sub")
-    if user_id is None:
+    jti = payload.get("jti")
+    family = payload.get("fam")
+    if user_id is None or jti is None or family is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
         )
+    user_id = int(user_id)
+    
+    # Revocation checks run in memory unless the filter reports a hit
+    await revocations.ensure_loaded()
+    if (
+        revocations.revoked_before(user_id, payload.get("iat"))
+        or await revocations.is_revoked(db, token_revocation.FAMILY, family)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revoked"
+        )
     
     # Verify user exists
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    user = await load_principal(db, user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -145,6 +229,60 @@ async def refresh_token(
             detail="User not found or inactive"
         )
     
-    # Return new tokens
-    return create_tokens(user.id)
+    # Use the token up; the unique row makes this succeed once across workers.
+    # The row keeps the new pair's jti and issue time so it can be sent again.
+    expires_at = datetime.utcfromtimestamp(payload["exp"])
+    issued_at = datetime.utcnow()
+    successor = uuid4().hex
+    if not await revocations.revoke(
+        db, token_revocation.TOKEN, jti, user_id, expires_at, revoked_at=issued_at, successor=successor
+    ):
+        rotation = await revocations.rotation(db, jti)
+        if rotation is not None and issued_at - rotation[1] <= timedelta(seconds=settings.REFRESH_REUSE_GRACE):
+            # Just rotated: the client retried, answer with the same pair
+            return create_tokens(user_id, family, jti=rotation[0], issued_at=rotation[1])
+        # Already rotated: the token was copied, end the whole session
+        revocations.reuse_detected += 1
+        await revocations.revoke(db, token_revocation.FAMILY, family, user_id, session_expires_at())
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revoked"
+        )
+    await db.commit()
+    
+    # Return new tokens of the same session
+    return create_tokens(user_id, family, jti=successor, issued_at=issued_at)
+
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token_data: RefreshTokenRequest,
+    db: AsyncSessionDep
+) -> None:
+    """End the login session of a refresh token (its access token lives until expiry)."""
+    payload = decode_token(token_data.refresh_token)
+    if (
+        payload is None
+        or payload.get("type") != "refresh"
+        or payload.get("sub") is None
+        or payload.get("fam") is None
+    ):
+        return
+    
+    await revocations.revoke(
+        db, token_revocation.FAMILY, payload["fam"], int(payload["sub"]), session_expires_at()
+    )
+    await db.commit()
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    current_user: CurrentUser,
+    db: AsyncSessionDep
+) -> None:
+    """Revoke every access and refresh token of the current user issued so far."""
+    await revocations.revoke(
+        db, token_revocation.USER, uuid4().hex, current_user.id, session_expires_at()
+    )
+    await db.commit()
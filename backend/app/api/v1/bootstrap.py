@@ -0,0 +1,116 @@
+import json
+
+from fastapi import APIRouter, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.api.v1.test import load_question_list
+from app.core.response_cache import (
+    PRIZES,
+    TEST_QUESTIONS,
+    if_none_match,
+    make_etag,
+    response_cache,
+)
+from app.models.application import Application
+from app.models.claimed_prize import ClaimedPrize
+from app.models.prize import Prize
+from app.models.user import User
+from app.models.user_progress import UserProgress
+from app.schemas.application import ApplicationResponse
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.prize import ClaimedPrizeResponse, PrizeResponse
+from app.schemas.user import UserProgressResponse, UserWithProgress
+from app.services import prize_stock
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+user_adapter = TypeAdapter(UserWithProgress)
+claimed_prizes_adapter = TypeAdapter(list[ClaimedPrizeResponse])
+application_adapter = TypeAdapter(ApplicationResponse | None)
+
+
+def _section(name: str, body: bytes, etag: str, known: set[str]) -> bytes:
+    """One section of the response; cached bodies are embedded as-is."""
+    prefix = f'"{name}":{{"etag":{json.dumps(etag)},'.encode()
+    if etag in known:
+        return prefix + b'"not_modified":true}'
+    return prefix + b'"data":' + body + b"}"
+
+
+def _known_etags(request: Request) -> set[str]:
+    header = request.headers.get("if-none-match") or ""
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+@router.get("", response_model=BootstrapResponse)
+async def bootstrap(
+    request: Request,
+    current_user: CurrentUser,
+    db: AsyncSessionDep
+) -> Response:
+    """Everything the app needs on launch in one round trip.
+
+    Send the etags of sections you already have in If-None-Match
+    (comma-separated); those come back as {"etag", "not_modified": true}
+    without data. If nothing changed at all the response is 304.
+    Costs two queries (user with progress and application, claimed
+    prizes) after the principal lookup; prizes and questions come from
+    the response cache and add one query each when it is cold.
+    """
+    # User, progress and application in one query
+    result = await db.execute(
+        select(User, UserProgress, Application)
+        .outerjoin(UserProgress, UserProgress.user_id == User.id)
+        .outerjoin(Application, Application.user_id == User.id)
+        .where(User.id == current_user.id)
+    )
+    user, progress, application = result.one()
+
+    result = await db.execute(
+        select(ClaimedPrize, Prize)
+        .join(Prize, ClaimedPrize.prize_id == Prize.id)
+        .where(ClaimedPrize.user_id == current_user.id)
+        .order_by(ClaimedPrize.claimed_at.desc())
+    )
+    claimed_prizes = [
+        ClaimedPrizeResponse(
+            id=claimed.id,
+            prize_id=claimed.prize_id,
+            claimed_at=claimed.claimed_at,
+            prize=PrizeResponse.model_validate(prize)
+        )
+        for claimed, prize in result.all()
+    ]
+
+    user_body = user_adapter.dump_json(UserWithProgress(
+        id=user.id,
+        email=user.email,
+        is_admin=user.is_admin,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        progress=UserProgressResponse.model_validate(progress) if progress else None
+    ))
+    claimed_body = claimed_prizes_adapter.dump_json(claimed_prizes)
+    application_body = application_adapter.dump_json(
+        ApplicationResponse.model_validate(application) if application else None
+    )
+    prizes = await response_cache.get_or_load(PRIZES, lambda: prize_stock.load_prize_list(db))
+    questions = await response_cache.get_or_load(TEST_QUESTIONS, lambda: load_question_list(db))
+
+    sections = [
+        ("user", user_body, make_etag(b"user:" + user_body)),
+        ("claimed_prizes", claimed_body, make_etag(b"claimed_prizes:" + claimed_body)),
+        ("application", application_body, make_etag(b"application:" + application_body)),
+        ("prizes", prizes.body, prizes.etag),
+        ("test_questions", questions.body, questions.etag),
+    ]
+    etag = make_etag(",".join(section_etag for _, _, section_etag in sections).encode())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    known = _known_etags(request)
+    body = b"{" + b",".join(_section(name, body, tag, known) for name, body, tag in sections) + b"}"
+    return Response(content=body, media_type="application/json", headers=headers)
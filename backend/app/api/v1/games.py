@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
 
 from app.api.deps import AsyncSessionDep, CurrentUser
 from app.models.user_progress import UserProgress
 from app.schemas.game import GameCompleteRequest, GameCompleteResponse
+from app.services import analytics, events, points_ledger
+from app.services import progress as progress_service
+from app.services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/games", tags=["games"])
 
@@ -20,24 +22,6 @@ async def complete_game(
     db: AsyncSessionDep
 ) -> GameCompleteResponse:
     """Complete a game and award points."""
-    # Get user progress
-    result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
-    )
-    progress = result.scalar_one_or_none()
-    
-    if not progress:
-        progress = UserProgress(user_id=current_user.id)
-        db.add(progress)
-        await db.flush()
-    
-    # Check if game already completed
-    if progress.completed_game:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Game already completed"
-        )
-    
     # Validate game type
     if game_data.game_type not in ["bug_catcher", "color_match"]:
         raise HTTPException(
@@ -49,16 +33,33 @@ async def complete_game(
     bonus_points = min(game_data.score // 2, GAME_MAX_BONUS)
     points_earned = GAME_BASE_POINTS + bonus_points
     
-    # Update progress
-    progress.completed_game = True
-    progress.points += points_earned
+    # Check, mark completed and award in one statement
+    total_points = await progress_service.award(
+        db,
+        current_user.id,
+        points_earned,
+        points_ledger.GAME_COMPLETED,
+        reference=game_data.game_type,
+        once=UserProgress.completed_game
+    )
+    if total_points is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Game already completed"
+        )
     
+    await analytics.increment(db, analytics.GAMES_COMPLETED)
     await db.commit()
-    await db.refresh(progress)
+    leaderboard.record(current_user, total_points)
+    events.emit(events.GAME_COMPLETED, {
+        "user_id": current_user.id,
+        "game_type": game_data.game_type,
+        "points_earned": points_earned,
+    })
     
     return GameCompleteResponse(
         points_earned=points_earned,
-        total_points=progress.points,
+        total_points=total_points,
         message=f"Game completed! You earned {points_earned} points ({GAME_BASE_POINTS} base + {bonus_points} bonus)"
     )
 
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Query
+from sqlalchemy import select
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardResponse
+from app.services.leaderboard import leaderboard
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+def mask_email(email: str) -> str:
+    """Public display name: ``iv***@mail.ru``."""
+    local, _, domain = email.partition("@")
+    return f"{local[:2]}***@{domain}"
+
+
+@router.get("", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    current_user: CurrentUser,
+    db: AsyncSessionDep,
+    limit: int | None = Query(None, ge=1),
+) -> LeaderboardResponse:
+    """Top users by points, served from the in-memory ranking."""
+    await leaderboard.ensure_loaded()
+    limit = min(limit or settings.LEADERBOARD_SIZE, settings.LEADERBOARD_SIZE_MAX)
+    top = leaderboard.top(limit)
+    
+    # Names for just the listed users (primary key lookup)
+    emails = {}
+    if top:
+        result = await db.execute(
+            select(User.id, User.email).where(User.id.in_([user_id for _, user_id, _ in top]))
+        )
+        emails = dict(result.all())
+    
+    return LeaderboardResponse(
+        entries=[
+            LeaderboardEntry(
+                rank=rank,
+                name=mask_email(emails.get(user_id, "")),
+                points=points,
+                is_me=user_id == current_user.id,
+            )
+            for rank, user_id, points in top
+        ],
+        participants=leaderboard.participants,
+    )
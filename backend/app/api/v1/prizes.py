@@ -1,26 +1,52 @@
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import AsyncSessionDep, CurrentUser
-from app.models.prize import Prize
-from app.models.claimed_prize import ClaimedPrize
-from app.models.user_progress import UserProgress
+from app.core.response_cache import PRIZES, cached_json_response, response_cache
 from app.schemas.prize import PrizeResponse
+from app.services import events, prize_claims, prize_stock
+from app.services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/prizes", tags=["prizes"])
 
 
 @router.get("", response_model=list[PrizeResponse])
 async def get_prizes(
+    request: Request,
     db: AsyncSessionDep
-) -> list[PrizeResponse]:
+) -> Response:
     """Get all prizes ordered by points."""
-    result = await db.execute(
-        select(Prize).order_by(Prize.points)
+    entry = await response_cache.get_or_load(PRIZES, lambda: prize_stock.load_prize_list(db))
+    return cached_json_response(request, entry)
+
+
+@router.get("/stream")
+async def stream_prize_stock(
+    last_event_id: str | None = Header(None)
+) -> StreamingResponse:
+    """Live prize stock as Server-Sent Events.
+    
+    Starts with a `snapshot` event (same body as GET /prizes), then sends
+    `stock` ({"id", "quantity"}) and `removed` ({"id"}) events as they
+    happen. Reconnects with Last-Event-ID continue where they left off.
+    """
+    stream = prize_stock.stock_hub.subscribe(prize_stock.snapshot, last_event_id)
+    if stream is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections, poll GET /prizes instead",
+            headers={"Retry-After": "5"}
+        )
+    
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable response buffering in nginx
+            "X-Accel-Buffering": "no",
+        }
     )
-    prizes = result.scalars().all()
-    return prizes
 
 
 @router.post("/{prize_id}/claim", response_model=dict)
@@ -30,73 +56,23 @@ async def claim_prize(
     db: AsyncSessionDep
 ) -> dict:
     """Claim a prize."""
-    # Get prize
-    result = await db.execute(select(Prize).where(Prize.id == prize_id))
-    prize = result.scalar_one_or_none()
-    
-    if not prize:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Prize not found"
-        )
-    
-    # Check if prize is available
-    if prize.quantity <= 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Prize is out of stock"
-        )
-    
-    # Get user progress
-    result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
-    )
-    progress = result.scalar_one_or_none()
-    
-    if not progress:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User has no points"
-        )
-    
-    # Check if user has enough points
-    if progress.points < prize.points:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Not enough points. Need {prize.points}, have {progress.points}"
-        )
+    try:
+        claim = await prize_claims.claim(db, current_user.id, prize_id)
+    except prize_claims.PrizeClaimError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     
-    # Check if already claimed
-    result = await db.execute(
-        select(ClaimedPrize).where(
-            ClaimedPrize.user_id == current_user.id,
-            ClaimedPrize.prize_id == prize_id
-        )
-    )
-    existing_claim = result.scalar_one_or_none()
-    
-    if existing_claim:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Prize already claimed"
-        )
-    
-    # Claim the prize
-    claimed_prize = ClaimedPrize(
-        user_id=current_user.id,
-        prize_id=prize_id
-    )
-    db.add(claimed_prize)
-    
-    # Deduct points and decrease quantity
-    progress.points -= prize.points
-    prize.quantity -= 1
-    
-    await db.commit()
+    # Stock and balance changed
+    response_cache.invalidate(PRIZES)
+    events.emit(events.PRIZE_CLAIMED, {
+        "user_id": current_user.id,
+        "prize_id": prize_id,
+        "prize_name": claim.prize_name,
+        "remaining_quantity": claim.remaining_quantity,
+    })
+    leaderboard.record(current_user, claim.remaining_points)
     
     return {
-        "message": f"Successfully claimed '{prize.name}'",
-        "remaining_points": progress.points,
-        "prize_name": prize.name
+        "message": f"Successfully claimed '{claim.prize_name}'",
+        "remaining_points": claim.remaining_points,
+        "prize_name": claim.prize_name
     }
-
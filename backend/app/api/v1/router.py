@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, users, test, games, prizes, applications, admin
+from app.api.v1 import auth, users, test, games, prizes, applications, admin, leaderboard, bootstrap
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -11,4 +11,6 @@ api_router.include_router(games.router)
 api_router.include_router(prizes.router)
 api_router.include_router(applications.router)
 api_router.include_router(admin.router)
+api_router.include_router(leaderboard.router)
+api_router.include_router(bootstrap.router)
 
@@ -1,28 +1,42 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy import select
 
 from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.response_cache import TEST_QUESTIONS, cached_json_response, response_cache
 from app.models.test_question import TestQuestion
 from app.models.user_progress import UserProgress
 from app.schemas.test import TestQuestionResponse, TestCompleteRequest
+from app.services import analytics, events, points_ledger
+from app.services import progress as progress_service
+from app.services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/test", tags=["test"])
 
 # Points for completing test
 TEST_COMPLETE_POINTS = 15
 
+question_list_adapter = TypeAdapter(list[TestQuestionResponse])
+
+
+async def load_question_list(db) -> bytes:
+    """All test questions in order, as the JSON body of GET /test/questions."""
+    result = await db.execute(
+        select(TestQuestion).order_by(TestQuestion.order)
+    )
+    questions = question_list_adapter.validate_python(result.scalars().all(), from_attributes=True)
+    return question_list_adapter.dump_json(questions)
+
 
 @router.get("/questions", response_model=list[TestQuestionResponse])
 async def get_test_questions(
+    request: Request,
     current_user: CurrentUser,
     db: AsyncSessionDep
-) -> list[TestQuestionResponse]:
+) -> Response:
     """Get all test questions ordered by order field."""
-    result = await db.execute(
-        select(TestQuestion).order_by(TestQuestion.order)
-    )
-    questions = result.scalars().all()
-    return questions
+    entry = await response_cache.get_or_load(TEST_QUESTIONS, lambda: load_question_list(db))
+    return cached_json_response(request, entry, cache_control="private, no-cache")
 
 
 @router.post("/complete", response_model=dict)
@@ -32,23 +46,6 @@ async def complete_test(
     db: AsyncSessionDep
 ) -> dict:
     """Complete the test and save result."""
-    # Get user progress
-    result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
-    )
-    progress = result.scalar_one_or_none()
-    
-    if not progress:
-        progress = UserProgress(user_id=current_user.id)
-        db.add(progress)
-    
-    # Check if test already completed
-    if progress.completed_test:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Test already completed"
-        )
-    
     # Validate result
     if test_data.result not in ["developer", "designer"]:
         raise HTTPException(
@@ -56,19 +53,31 @@ async def complete_test(
             detail="Invalid test result. Must be 'developer' or 'designer'"
         )
     
-    # Update progress
-    progress.completed_test = True
-    progress.test_result = test_data.result
-    progress.points += TEST_COMPLETE_POINTS
+    # Check, mark completed and award in one statement
+    total_points = await progress_service.award(
+        db,
+        current_user.id,
+        TEST_COMPLETE_POINTS,
+        points_ledger.TEST_COMPLETED,
+        once=UserProgress.completed_test,
+        test_result=test_data.result
+    )
+    if total_points is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Test already completed"
+        )
     
+    await analytics.increment(db, analytics.TESTS_COMPLETED)
     await db.commit()
-    await db.refresh(progress)
+    leaderboard.record(current_user, total_points)
+    events.emit(events.TEST_COMPLETED, {"user_id": current_user.id, "result": test_data.result})
     
     return {
         "message": "Test completed successfully",
         "result": test_data.result,
         "points_earned": TEST_COMPLETE_POINTS,
-        "total_points": progress.points
+        "total_points": total_points
     }
 
 
@@ -78,25 +87,19 @@ async def skip_test(
     db: AsyncSessionDep
 ) -> dict:
     """Skip the test (no points awarded)."""
-    result = await db.execute(
-        select(UserProgress).where(UserProgress.user_id == current_user.id)
+    # test_result remains None when skipped
+    total_points = await progress_service.award(
+        db, current_user.id, 0, points_ledger.TEST_COMPLETED, once=UserProgress.completed_test
     )
-    progress = result.scalar_one_or_none()
-    
-    if not progress:
-        progress = UserProgress(user_id=current_user.id)
-        db.add(progress)
-    
-    if progress.completed_test:
+    if total_points is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Test already completed"
         )
     
-    progress.completed_test = True
-    # test_result remains None when skipped
-    
+    await analytics.increment(db, analytics.TESTS_COMPLETED)
     await db.commit()
+    events.emit(events.TEST_COMPLETED, {"user_id": current_user.id, "result": None})
     
     return {"message": "Test skipped"}
 
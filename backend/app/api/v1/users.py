@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.config import settings
 from app.models.user import User
 from app.models.user_progress import UserProgress
 from app.models.claimed_prize import ClaimedPrize
 from app.schemas.user import UserResponse, UserProgressResponse, UserWithProgress
 from app.schemas.prize import ClaimedPrizeResponse
+from app.schemas.leaderboard import UserRankResponse
+from app.schemas.pagination import Page
+from app.schemas.points import PointsLedgerEntryResponse
+from app.services import points_ledger
+from app.services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -49,6 +55,25 @@ async def get_user_progress(
     return progress
 
 
+@router.get("/me/points/history", response_model=Page[PointsLedgerEntryResponse])
+async def get_points_history(
+    current_user: CurrentUser,
+    db: AsyncSessionDep,
+    cursor: str | None = None,
+    limit: int = Query(settings.POINTS_HISTORY_PAGE_SIZE, ge=1, le=settings.POINTS_HISTORY_PAGE_SIZE_MAX)
+) -> Page[PointsLedgerEntryResponse]:
+    """Get a page of the current user's points history, newest first."""
+    return await points_ledger.history(db, current_user.id, cursor, limit)
+
+
+@router.get("/me/rank", response_model=UserRankResponse)
+async def get_user_rank(current_user: CurrentUser) -> UserRankResponse:
+    """Get current user's leaderboard position (no database access)."""
+    await leaderboard.ensure_loaded()
+    rank, points = leaderboard.rank(current_user.id)
+    return UserRankResponse(rank=rank, points=points, participants=leaderboard.participants)
+
+
 @router.get("/me/claimed-prizes", response_model=list[ClaimedPrizeResponse])
 async def get_claimed_prizes(
     current_user: CurrentUser,
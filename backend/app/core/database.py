@@ -1,12 +1,60 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection.
+
+    Counters live on the class so they survive pool re-creation on
+    ``engine.dispose()``.
+    """
+
+    acquisitions = 0
+    timeouts = 0
+    total_wait = 0.0
+    max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            cls = type(self)
+            cls.acquisitions += 1
+            cls.total_wait += waited
+            cls.max_wait = max(cls.max_wait, waited)
+
+
+def _engine_options() -> dict:
+    options = {
+        "echo": settings.SQL_ECHO,
+        "future": True,
+    }
+    if settings.DATABASE_URL.startswith("postgresql"):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    if settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+        # Set to 0 behind pgbouncer in transaction mode
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -26,3 +74,26 @@ async def get_async_session() -> AsyncSession:
         finally:
             await session.close()
 
+
+def pool_stats() -> dict:
+    """Live connection pool statistics for monitoring."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        cls = InstrumentedAsyncQueuePool
+        stats.update(
+            acquisitions=cls.acquisitions,
+            timeouts=cls.timeouts,
+            avg_wait_ms=cls.total_wait / cls.acquisitions * 1000 if cls.acquisitions else 0.0,
+            max_wait_ms=cls.max_wait * 1000,
+        )
+    return stats
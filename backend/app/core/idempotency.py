@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different request."""
+
+
+class IdempotencyStore:
+    """In-process store of responses by (user id, Idempotency-Key).
+
+    The first request with a key runs the handler; its response is kept
+    for ``ttl`` seconds and replayed to later requests with the same key.
+    Duplicates that arrive while the first one is still running wait for
+    it instead of running the handler again. Entries expire in insertion
+    order, so expired ones are dropped from the front on every call;
+    ``max_keys`` bounds memory regardless of the TTL.
+    """
+
+    def __init__(self, ttl: float, max_keys: int):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        # (user_id, key) -> (expires_at, fingerprint, StoredResponse)
+        self._entries: OrderedDict[tuple[int, str], tuple[float, str, StoredResponse]] = OrderedDict()
+        # (user_id, key) -> (fingerprint, future resolved when the first request finishes)
+        self._in_flight: dict[tuple[int, str], tuple[str, asyncio.Future]] = {}
+        self.replayed = 0
+        self.waited = 0
+
+    async def begin(self, user_id: int, key: str, fingerprint: str) -> StoredResponse | None:
+        """Stored response to replay, or None if the caller should run the request.
+
+        A caller that gets None must call ``finish`` (with or without a
+        response) once it is done. Raises IdempotencyConflict if the key
+        was used for another method/path or body.
+        """
+        entry_key = (user_id, key)
+        while True:
+            self._purge()
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._check(entry[1], fingerprint)
+                self.replayed += 1
+                return entry[2]
+
+            pending = self._in_flight.get(entry_key)
+            if pending is None:
+                future = asyncio.get_running_loop().create_future()
+                self._in_flight[entry_key] = (fingerprint, future)
+                return None
+
+            self._check(pending[0], fingerprint)
+            self.waited += 1
+            response = await asyncio.shield(pending[1])
+            if response is not None:
+                self.replayed += 1
+                return response
+            # The first request ended without a storable response: try again
+
+    def finish(self, user_id: int, key: str, response: StoredResponse | None) -> None:
+        """Store the response of the request ``begin`` let through and wake waiters."""
+        entry_key = (user_id, key)
+        fingerprint, future = self._in_flight.pop(entry_key)
+        if response is not None:
+            self._entries[entry_key] = (time.monotonic() + self.ttl, fingerprint, response)
+            if len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        if not future.done():
+            future.set_result(response)
+
+    def stats(self) -> dict:
+        self._purge()
+        return {
+            "keys": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "replayed": self.replayed,
+            "waited": self.waited,
+        }
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            expires_at = next(iter(self._entries.values()))[0]
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _check(stored: str, fingerprint: str) -> None:
+        if stored != fingerprint:
+            raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL,
+    max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+)
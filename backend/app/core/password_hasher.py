@@ -0,0 +1,161 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+class PasswordHasherUnavailable(Exception):
+    """Raised when a hashing call cannot be served right now."""
+
+
+class PasswordHasherOverloaded(PasswordHasherUnavailable):
+    """Raised when the wait queue is full."""
+
+
+class PasswordHasherTimeout(PasswordHasherUnavailable):
+    """Raised when a call did not finish within the configured timeout."""
+
+
+class PasswordHasher:
+    """Async facade over bcrypt backed by a bounded process pool.
+
+    At most ``workers`` hashes run at once; up to ``queue_size`` further
+    calls wait for a free worker and anything beyond that is rejected
+    immediately, so a burst of logins cannot pile up unbounded work.
+    A call that times out keeps its worker until bcrypt finishes, so the
+    executor never holds more jobs than there are workers. ``workers=0``
+    hashes in a thread pool instead (bcrypt releases the GIL).
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        # Same default size as asyncio's own thread pool
+        self.concurrency = workers if workers > 0 else min(32, (os.cpu_count() or 1) + 4)
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_seconds = 0.0
+
+    async def start(self) -> None:
+        """Create the worker pool and warm up every worker."""
+        if self._slots is not None:
+            return
+        self._slots = asyncio.Semaphore(self.concurrency)
+        if self.workers > 0:
+            # spawn, not fork: forking a process that runs an event loop
+            # and driver threads is not safe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            # workers=0 hashes in threads (dev/scripts)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="password-hash"
+            )
+        await asyncio.gather(*(self.hash("warmup") for _ in range(max(self.workers, 1))))
+
+    async def shutdown(self) -> None:
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._slots = None
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        with metrics.Timer(metrics.password_hash_duration_seconds, "hash"):
+            return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        with metrics.Timer(metrics.password_hash_duration_seconds, "verify"):
+            return await self._run(verify_password, plain_password, hashed_password)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker."""
+        return self._waiting
+
+    def expected_wait(self) -> float:
+        """Rough seconds until a call queued now would start."""
+        avg = self._total_seconds / self._completed if self._completed else 0.0
+        return self._waiting * avg / self.concurrency
+
+    def stats(self) -> dict:
+        """Snapshot of pool counters for monitoring."""
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_seconds": self._total_seconds / self._completed if self._completed else 0.0,
+        }
+
+    async def _run(self, func, *args):
+        if self._slots is None:
+            # Not started (e.g. scripts); fall back to a lazily created pool
+            await self.start()
+
+        if self._waiting >= self.queue_size:
+            self._rejected += 1
+            raise PasswordHasherOverloaded("Password hashing queue is full")
+
+        try:
+            return await asyncio.wait_for(self._execute(func, *args), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            raise PasswordHasherTimeout("Password hashing timed out")
+
+    async def _execute(self, func, *args):
+        slots = self._slots
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            job = loop.run_in_executor(self._executor, func, *args)
+        except BaseException:
+            self._in_flight -= 1
+            slots.release()
+            raise
+
+        def finished(job: asyncio.Future) -> None:
+            # The slot follows the job, not the caller: a timed out call
+            # stops waiting but bcrypt keeps the worker until it is done
+            self._in_flight -= 1
+            slots.release()
+            if not job.cancelled() and job.exception() is None:
+                self._completed += 1
+                self._total_seconds += time.perf_counter() - started
+
+        job.add_done_callback(finished)
+        # Shielded so a timeout does not cancel the job (and release early)
+        return await asyncio.shield(job)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT,
+)
@@ -0,0 +1,70 @@
+import math
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class TokenBucketLimiter:
+    """In-memory token buckets, one per key (client IP, email).
+
+    Each bucket holds up to ``burst`` tokens and refills at ``rate``
+    tokens per second; a request takes one token. Buckets live in a
+    bounded LRU, so a flood of distinct keys evicts idle buckets instead
+    of growing memory (an evicted key simply starts with a full bucket).
+    Limits are per worker process.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens, monotonic time of last update)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.rejected = 0
+
+    def take(self, key: str) -> float:
+        """Take a token for ``key``; 0 if allowed, else seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            retry_after = 0.0
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+            self.rejected += 1
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "rate": self.rate,
+            "burst": self.burst,
+            "rejected": self.rejected,
+        }
+
+
+def retry_after_header(seconds: float) -> str:
+    """Retry-After value in whole seconds, at least 1."""
+    return str(max(1, math.ceil(seconds)))
+
+
+auth_ip_limiter = TokenBucketLimiter(
+    rate=settings.AUTH_IP_RATE,
+    burst=settings.AUTH_IP_BURST,
+    max_keys=settings.AUTH_RATE_LIMIT_KEYS,
+)
+auth_email_limiter = TokenBucketLimiter(
+    rate=settings.AUTH_EMAIL_RATE,
+    burst=settings.AUTH_EMAIL_BURST,
+    max_keys=settings.AUTH_RATE_LIMIT_KEYS,
+)
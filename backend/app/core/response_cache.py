@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Cache keys
+PRIZES = "prizes"
+TEST_QUESTIONS = "test_questions"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the body, so it is stable across workers."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class ResponseCache:
+    """In-process cache of serialized JSON response bodies.
+
+    Each key has a version that ``invalidate`` bumps; a load that started
+    before an invalidation is returned to its callers but not stored, so
+    stale data never outlives the write that replaced it. Concurrent
+    misses for the same key share one load (single-flight). The TTL only
+    bounds staleness caused by writes handled in other worker processes.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, CachedBody] = {}
+        self._versions: dict[str, int] = {}
+        self._loading: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> CachedBody:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        version = self._versions.get(key, 0)
+        try:
+            body = await loader()
+            entry = CachedBody(body=body, etag=make_etag(body), expires_at=time.monotonic() + self.ttl)
+            if self._versions.get(key, 0) == version:
+                self._entries[key] = entry
+            future.set_result(entry)
+            return entry
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a leader-only failure is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+    def invalidate(self, key: str) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._entries.pop(key, None)
+        # Callers arriving after the write must not join a load that may
+        # have read the old data
+        self._loading.pop(key, None)
+
+    def stats(self) -> dict:
+        """Snapshot of cache counters for monitoring."""
+        return {
+            "keys": sorted(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cached_json_response(request: Request, entry: CachedBody, cache_control: str = "no-cache") -> Response:
+    """Build a 200 (or 304 on ETag match) response for a cached body."""
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+    if if_none_match(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(ttl=settings.RESPONSE_CACHE_TTL)
@@ -1,5 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
+from uuid import uuid4
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -20,15 +21,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: int | Any, expires_delta: timedelta | None = None) -> str:
+def _issued(issued_at: datetime | None) -> tuple[datetime, float]:
+    """Issue time as naive UTC (``exp`` is counted from it) and as epoch seconds (``iat``)."""
+    if issued_at is None:
+        issued_at = datetime.utcnow()
+    return issued_at, issued_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def create_access_token(
+    subject: int | Any,
+    expires_delta: timedelta | None = None,
+    issued_at: datetime | None = None
+) -> str:
     """Create an access token."""
+    issued_at, iat = _issued(issued_at)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = issued_at + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {
         "exp": expire,
+        "iat": iat,  # fractional, compared with logout-everywhere cutoffs
         "sub": str(subject),
         "type": "access"
     }
@@ -36,17 +50,32 @@ def create_access_token(subject: int | Any, expires_delta: timedelta | None = No
     return encoded_jwt
 
 
-def create_refresh_token(subject: int | Any, expires_delta: timedelta | None = None) -> str:
-    """Create a refresh token."""
+def create_refresh_token(
+    subject: int | Any,
+    family: str | None = None,
+    expires_delta: timedelta | None = None,
+    jti: str | None = None,
+    issued_at: datetime | None = None
+) -> str:
+    """Create a refresh token.
+    
+    Every refresh token has its own ``jti`` and belongs to a ``fam``
+    (login session) that is kept when the token is rotated. The same
+    ``jti`` and ``issued_at`` encode the same token again.
+    """
+    issued_at, iat = _issued(issued_at)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = issued_at + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode = {
         "exp": expire,
+        "iat": iat,
         "sub": str(subject),
-        "type": "refresh"
+        "type": "refresh",
+        "jti": jti or uuid4().hex,
+        "fam": family or uuid4().hex,
     }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
@@ -61,10 +90,18 @@ def decode_token(token: str) -> dict | None:
         return None
 
 
-def create_tokens(user_id: int) -> dict:
-    """Create both access and refresh tokens."""
-    access_token = create_access_token(user_id)
-    refresh_token = create_refresh_token(user_id)
+def create_tokens(
+    user_id: int,
+    family: str | None = None,
+    jti: str | None = None,
+    issued_at: datetime | None = None
+) -> dict:
+    """Create both access and refresh tokens (a new login session unless ``family`` is given).
+    
+    Given the ``jti`` and ``issued_at`` of an earlier pair, returns that pair again.
+    """
+    access_token = create_access_token(user_id, issued_at=issued_at)
+    refresh_token = create_refresh_token(user_id, family, jti=jti, issued_at=issued_at)
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
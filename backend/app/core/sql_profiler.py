@@ -0,0 +1,103 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+
+
+@dataclass
+class QueryProfile:
+    """SQL statements executed within one request (or test block)."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    # Off for counting only (request metrics): skips normalizing the SQL text
+    track_statements: bool = True
+    # Enclosing profile (e.g. a test around a profiled request) sees the same queries
+    parent: "QueryProfile | None" = field(default=None, repr=False)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if self.track_statements:
+            self.statements[" ".join(statement.split())] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Identical statements run at least ``threshold`` times (likely N+1)."""
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar("sql_profile", default=None)
+_instrumented: set[int] = set()
+
+
+def instrument_engine(sync_engine) -> None:
+    """Time every statement and record it on the active profile.
+
+    Safe to call more than once per engine.
+    """
+    if id(sync_engine) in _instrumented:
+        return
+    _instrumented.add(id(sync_engine))
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        started = conn.info.get("sql_profiler_started")
+        if profile is not None and started:
+            profile.record(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("sql_profiler_started") if conn is not None else None
+        if started:
+            started.pop()
+
+
+@contextmanager
+def profile_queries(track_statements: bool = True) -> Iterator[QueryProfile]:
+    """Collect the statements executed inside the block.
+
+    Profiles nest: request metrics and the SQL profiler middleware share
+    the same engine listeners, each reading its own profile.
+    """
+    profile = QueryProfile(parent=_current_profile.get(), track_statements=track_statements)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine) -> Iterator[QueryProfile]:
+    """Fail if the block executes more than ``limit`` statements on ``engine``.
+
+    For tests::
+
+        with assert_max_queries(3, engine):
+            await client.get("/api/v1/users/me", headers=headers)
+
+    ``engine`` (async or sync) is instrumented here, so a budget is never
+    checked against an engine nobody counts. Works with in-process
+    clients (httpx ASGITransport), which run the app in the caller's
+    context.
+    """
+    instrument_engine(getattr(engine, "sync_engine", engine))
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        listing = "\n".join(f"  {n}x {sql}" for sql, n in profile.statements.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, got {profile.count}:\n{listing}")
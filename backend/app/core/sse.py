@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+import weakref
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+
+def format_event(event: str, data: Any, event_id: str | None = None) -> bytes:
+    """Encode one Server-Sent Event; ``data`` is JSON-encoded unless bytes."""
+    if not isinstance(data, (bytes, bytearray)):
+        data = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    lines = [f"event: {event}".encode()]
+    if event_id is not None:
+        lines.append(f"id: {event_id}".encode())
+    lines.extend(b"data: " + line for line in bytes(data).split(b"\n"))
+    return b"\n".join(lines) + b"\n\n"
+
+
+class SSEHub:
+    """Fan-out of server-sent events to many idle subscribers.
+
+    Published events go into a ring buffer; subscribers keep only a cursor
+    into it and sleep on one shared future that ``publish`` resolves, so an
+    idle connection costs a suspended generator and nothing per event
+    until it wakes. A client that reconnects with ``Last-Event-ID`` gets
+    the events it missed; if they have left the buffer (or it reconnects
+    to another process) it gets a fresh snapshot instead.
+    """
+
+    def __init__(self, name: str, buffer_size: int, heartbeat: float, max_subscribers: int):
+        self.name = name
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        # Ids are "<epoch>-<seq>"; the epoch tells apart ids from another process/run
+        self._epoch = f"{time.time_ns():x}"
+        self._seq = 0
+        self._buffer: deque[tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._waiter: asyncio.Future | None = None
+        self.subscribers = 0
+
+    def publish(self, event: str, data: Any) -> None:
+        self._seq += 1
+        self._buffer.append((self._seq, format_event(event, data, self._event_id(self._seq))))
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        self._waiter = None
+
+    def subscribe(
+        self,
+        snapshot: Callable[[], Awaitable[Any]],
+        last_event_id: str | None = None,
+        snapshot_event: str = "snapshot",
+    ) -> AsyncIterator[bytes] | None:
+        """Take a subscriber slot and return the event stream; None if the hub is full.
+
+        The slot is taken here, before any await, so concurrent requests
+        cannot overshoot ``max_subscribers``. It is given back when the
+        stream ends, or when the stream is garbage collected without
+        having started (client gone before the response began).
+        """
+        if self.subscribers >= self.max_subscribers:
+            return None
+        self.subscribers += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.subscribers -= 1
+
+        stream = self._stream(snapshot, last_event_id, snapshot_event, release)
+        weakref.finalize(stream, release)
+        return stream
+
+    async def _stream(
+        self,
+        snapshot: Callable[[], Awaitable[Any]],
+        last_event_id: str | None,
+        snapshot_event: str,
+        release: Callable[[], None],
+    ) -> AsyncIterator[bytes]:
+        """Yield encoded events until the client goes away.
+
+        ``snapshot`` returns the full current state; it is sent first
+        unless the client can resume from ``last_event_id``.
+        """
+        try:
+            yield b"retry: 3000\n\n"
+            cursor = self._resume_point(last_event_id)
+            if cursor is None:
+                cursor = self._seq
+                yield format_event(snapshot_event, await snapshot(), self._event_id(cursor))
+
+            while True:
+                if cursor < self._seq:
+                    oldest = self._buffer[0][0]
+                    if cursor < oldest - 1:
+                        # Fell behind the ring buffer: start over from a snapshot
+                        cursor = self._seq
+                        yield format_event(snapshot_event, await snapshot(), self._event_id(cursor))
+                        continue
+                    # Only the newest entries are new to this subscriber
+                    pending = list(islice(reversed(self._buffer), self._seq - cursor))
+                    pending.reverse()
+                    cursor = pending[-1][0]
+                    for _, payload in pending:
+                        yield payload
+                    continue
+
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._wait()), self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Keeps proxies and mobile networks from dropping the idle connection
+                    yield b": ping\n\n"
+        finally:
+            release()
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "max_subscribers": self.max_subscribers,
+            "last_event_id": self._event_id(self._seq),
+            "buffered": len(self._buffer),
+        }
+
+    def _event_id(self, seq: int) -> str:
+        return f"{self._epoch}-{seq}"
+
+    def _wait(self) -> asyncio.Future:
+        if self._waiter is None:
+            self._waiter = asyncio.get_running_loop().create_future()
+        return self._waiter
+
+    def _resume_point(self, last_event_id: str | None) -> int | None:
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
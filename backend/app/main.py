@@ -1,12 +1,29 @@
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.router import api_router
+from app.core import metrics
 from app.core.config import settings
+from app.core.database import async_session_maker, engine, pool_stats
+from app.core.idempotency import idempotency_store
+from app.core.password_hasher import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import auth_email_limiter, auth_ip_limiter
+from app.core.response_cache import response_cache
+from app.core.responses import FastJSONResponse
+from app.core import sql_profiler
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.sql_profiler import SQLProfilerMiddleware
+from app.middleware.uploads import MULTIPART_OVERHEAD, UploadLimitMiddleware
+from app.services import admin_feed, analytics, leaderboard, prize_stock, token_revocation
 
 
 @asynccontextmanager
@@ -16,11 +33,27 @@ async def lifespan(app: FastAPI):
     # Create uploads directory if not exists
     upload_dir = Path(settings.UPLOAD_DIR)
     upload_dir.mkdir(parents=True, exist_ok=True)
+    # Start bcrypt worker pool
+    await password_hasher.start()
+    # Dashboard counter rows must exist before handlers increment them
+    async with async_session_maker() as db:
+        await analytics.ensure_counters(db)
+    # Keep the in-memory leaderboard in sync with other workers
+    leaderboard_refresh = asyncio.create_task(leaderboard.refresh_periodically())
+    # Push stock changes made by other workers to this worker's SSE clients
+    stock_sync = asyncio.create_task(prize_stock.sync_periodically())
+    admin_sync = asyncio.create_task(admin_feed.sync_periodically())
+    # Load revoked refresh tokens, then follow other workers and prune
+    revocation_sync = asyncio.create_task(token_revocation.sync_periodically())
     
     yield
     
     # Shutdown
-    pass
+    leaderboard_refresh.cancel()
+    stock_sync.cancel()
+    admin_sync.cancel()
+    revocation_sync.cancel()
+    await password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -28,11 +61,80 @@ app = FastAPI(
     description="Backend API for X5 Tech Career Day application",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
 
-# CORS middleware
+# Upload size and concurrency limits
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    max_concurrent=settings.MAX_CONCURRENT_UPLOADS,
+    wait_timeout=settings.UPLOAD_SLOT_TIMEOUT,
+)
+
+# Replay retried POSTs carrying an Idempotency-Key (outside the upload
+# limit, so a replay does not take an upload slot)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
+# gzip/brotli for large text responses (skips event streams and binary files)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Per-request SQL profiling (opt-in; Server-Timing header + log line)
+if settings.SQL_PROFILER_ENABLED:
+    sql_profiler.instrument_engine(engine.sync_engine)
+    app.add_middleware(SQLProfilerMiddleware, repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD)
+
+# Request metrics (outside everything but CORS, so it times everything below)
+if settings.METRICS_ENABLED:
+    # Same engine listeners as the SQL profiler; registered once
+    sql_profiler.instrument_engine(engine.sync_engine)
+    metrics.register_callback_gauges({
+        "password_hash_queue_depth": (
+            "Password hashing calls waiting for a worker",
+            lambda: password_hasher.queue_depth,
+        ),
+        "password_hash_in_flight": (
+            "Password hashing calls running in workers",
+            lambda: password_hasher.stats()["in_flight"],
+        ),
+        "db_pool_checked_out": (
+            "Database connections in use",
+            lambda: pool_stats().get("checked_out", 0),
+        ),
+        "db_pool_overflow": (
+            "Database connections opened above pool size",
+            lambda: pool_stats().get("overflow", 0),
+        ),
+        "db_pool_max_wait_seconds": (
+            "Longest wait for a database connection since start",
+            lambda: pool_stats().get("max_wait_ms", 0.0) / 1000,
+        ),
+        "sse_prize_stock_subscribers": (
+            "Open GET /prizes/stream connections",
+            lambda: prize_stock.stock_hub.subscribers,
+        ),
+        "sse_admin_subscribers": (
+            "Open GET /admin/stream connections",
+            lambda: admin_feed.admin_hub.subscribers,
+        ),
+        "principal_cache_hit_ratio": (
+            "Authenticated principal cache hit ratio",
+            lambda: principal_cache.stats()["hit_ratio"],
+        ),
+    })
+    app.add_middleware(MetricsMiddleware)
+
+# CORS (added last, so outermost: errors answered by the middlewares above,
+# e.g. 413/503 from the upload limit, still carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
@@ -56,6 +158,72 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/password-hasher")
+async def password_hasher_stats():
+    """Password hashing pool statistics (queue depth, timings)."""
+    return password_hasher.stats()
+
+
+@app.get("/health/auth-limits")
+async def auth_limit_stats():
+    """Auth rate limiter statistics (tracked keys, rejections)."""
+    return {
+        "ip": auth_ip_limiter.stats(),
+        "email": auth_email_limiter.stats(),
+        "shed_queue_depth": settings.AUTH_SHED_QUEUE_DEPTH,
+    }
+
+
+@app.get("/health/idempotency")
+async def idempotency_stats():
+    """Idempotency-Key store statistics (stored keys, replays)."""
+    return idempotency_store.stats()
+
+
+@app.get("/health/token-revocation")
+async def token_revocation_stats():
+    """Refresh token revocation filter statistics (items, hits, reuse)."""
+    return token_revocation.revocations.stats()
+
+
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    """Database connection pool statistics (checked out, overflow, wait time)."""
+    return pool_stats()
+
+
+@app.get("/health/principal-cache")
+async def principal_cache_stats():
+    """Authenticated principal cache statistics (hits, misses, size)."""
+    return principal_cache.stats()
+
+
+@app.get("/health/response-cache")
+async def response_cache_stats():
+    """Cached response statistics (hits, misses, cached keys)."""
+    return response_cache.stats()
+
+
+@app.get("/health/sse")
+async def sse_stats():
+    """Live update streams (subscribers, buffered events)."""
+    return {
+        "prize_stock": prize_stock.stock_hub.stats(),
+        "admin": admin_feed.admin_hub.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus metrics in text exposition format."""
+    # Internal endpoint: hidden unless a scrape token is configured
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
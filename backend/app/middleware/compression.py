@@ -0,0 +1,176 @@
+import gzip
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only
+    brotli = None
+
+# Worth compressing; images, PDFs, xlsx and other binary formats are
+# already compressed or gain nothing
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, as the client accepts.
+
+    Skipped for bodies under ``minimum_size``, non-text content types
+    (resume downloads, xlsx), responses that already have a
+    Content-Encoding or ``Cache-Control: no-transform``, partial content
+    and event streams, which must reach the client event by event.
+    A body sent in one message is compressed whole; a streamed one
+    (CSV export) chunk by chunk with a flush after each chunk. Anything
+    of ``offload_size`` bytes or more is compressed in the threadpool so
+    large bodies do not stall the event loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        offload_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not _compressible(start)
+                if passthrough:
+                    await send(start)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Whole body known and too small to bother
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    # Different bytes than the identity body
+                    headers["ETag"] = "W/" + headers["etag"]
+                del headers["content-length"]
+                if not more_body:
+                    data = await self._run(compressor.compress_all, body)
+                    headers["Content-Length"] = str(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send(start)
+
+            data = await self._run(compressor.compress_chunk, body, not more_body)
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _run(self, func, data: bytes, *args):
+        if len(data) >= self.offload_size:
+            return await run_in_threadpool(func, data, *args)
+        return func(data, *args)
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._stream = None
+
+    def compress_all(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_chunk(self, data: bytes, last: bool) -> bytes:
+        if self.encoding == "br":
+            if self._stream is None:
+                self._stream = brotli.Compressor(quality=self.brotli_quality)
+            out = self._stream.process(data)
+            return out + (self._stream.finish() if last else self._stream.flush())
+        if self._stream is None:
+            self._stream = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        out = self._stream.compress(data)
+        return out + self._stream.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Supported coding with the highest q the client accepts; br wins ties."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        quality = accepted.get(coding, wildcard)
+        # Strictly greater: on a tie the earlier (preferred) coding stays
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compressible(start: Message) -> bool:
+    if not 200 <= start["status"] < 300 or start["status"] in (204, 206):
+        return False
+    headers = Headers(raw=start["headers"])
+    if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
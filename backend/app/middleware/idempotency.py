@@ -0,0 +1,142 @@
+import hashlib
+
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.idempotency import IdempotencyConflict, IdempotencyStore, StoredResponse
+from app.core.security import decode_token
+from app.middleware.uploads import send_error
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+MAX_KEY_LENGTH = 255
+# Larger responses are passed through but not stored
+MAX_STORED_BODY = 64 * 1024
+# Transient outcomes are not replayed; a retry should really retry
+NOT_STORED_STATUSES = {
+    status.HTTP_401_UNAUTHORIZED,
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+
+class IdempotencyMiddleware:
+    """Replay responses of retried state-changing requests.
+
+    A POST/PUT/PATCH/DELETE with an ``Idempotency-Key`` header and a
+    valid access token runs once per (user, key); retries get the stored
+    status, headers and body with ``Idempotent-Replayed: true`` and never
+    reach the handler or the database. Reusing a key for another
+    method/path or another JSON body is a 422 (multipart bodies are
+    streamed to the handler unread, so only their method/path count).
+    Requests without the header, anonymous ones and
+    5xx/401/408/429 outcomes are not stored. The store is per worker
+    process.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        user_id = _user_id(headers.get("authorization", ""))
+        if key is None or user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await send_error(send, status.HTTP_400_BAD_REQUEST, "Invalid Idempotency-Key")
+            return
+
+        # JSON bodies are small and read whole by the handler anyway
+        body_hash = ""
+        if headers.get("content-type", "").startswith("application/json"):
+            body, receive = await _read_body(receive)
+            body_hash = hashlib.sha256(body).hexdigest()
+        fingerprint = f"{scope['method']} {scope['path']} {body_hash}"
+        try:
+            stored = await self.store.begin(user_id, key, fingerprint)
+        except IdempotencyConflict as exc:
+            await send_error(send, status.HTTP_422_UNPROCESSABLE_ENTITY, str(exc))
+            return
+
+        if stored is not None:
+            await _replay(stored, send)
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+        size = 0
+        complete = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, size, complete
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body" and start is not None:
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= MAX_STORED_BODY:
+                    chunks.append(body)
+                if not message.get("more_body", False):
+                    complete = True
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if complete and size <= MAX_STORED_BODY and _storable(start["status"]):
+                response = StoredResponse(
+                    status=start["status"],
+                    headers=list(start.get("headers", [])),
+                    body=b"".join(chunks),
+                )
+            self.store.finish(user_id, key, response)
+
+
+def _user_id(authorization: str) -> int | None:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access" or payload.get("sub") is None:
+        return None
+    return int(payload["sub"])
+
+
+async def _read_body(receive: Receive) -> tuple[bytes, Receive]:
+    """Read the request body; the returned receive hands it to the app again."""
+    messages: list[Message] = []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            break
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.request")
+
+    async def replay() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return body, replay
+
+
+def _storable(status_code: int) -> bool:
+    return status_code < 500 and status_code not in NOT_STORED_STATUSES
+
+
+async def _replay(stored: StoredResponse, send: Send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status,
+        "headers": [*stored.headers, (b"idempotent-replayed", b"true")],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
@@ -0,0 +1,45 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.sql_profiler import profile_queries
+
+
+class MetricsMiddleware:
+    """Record latency, status and DB query count per route template.
+
+    Routes are labelled by their path template (``/api/v1/prizes/{prize_id}/claim``)
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        metrics.http_requests_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Counted by the SQL profiler's engine listeners
+        with profile_queries(track_statements=False) as queries:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                metrics.http_requests_in_flight.dec()
+                route = scope.get("route")
+                route_label = getattr(route, "path", None) or "unmatched"
+                method = scope["method"]
+                metrics.http_request_duration_seconds.observe(time.perf_counter() - started, method, route_label)
+                metrics.http_requests_total.inc(method, route_label, str(status_code))
+                metrics.http_request_db_queries.observe(queries.count, method, route_label)
@@ -0,0 +1,74 @@
+import json
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.sql_profiler import profile_queries
+
+logger = logging.getLogger("app.sql_profiler")
+
+
+class SQLProfilerMiddleware:
+    """Report SQL round trips per request.
+
+    Adds ``Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>``
+    to every response and logs one JSON line per request. Statements run
+    ``repeat_threshold`` or more times in a single request are listed
+    under ``repeated`` and logged as a warning (likely N+1).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        with profile_queries() as profile:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    # Headers go out before the body, so queries run while
+                    # streaming the body are only counted in the log line
+                    timing = (
+                        f'db;dur={profile.duration * 1000:.1f};desc="{profile.count} queries", '
+                        f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._log(scope, status_code, time.perf_counter() - started, profile)
+
+    def _log(self, scope: Scope, status_code: int, elapsed: float, profile) -> None:
+        repeated = profile.repeated(self.repeat_threshold)
+        route = scope.get("route")
+        record = {
+            "event": "sql_profile",
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(elapsed * 1000, 1),
+            "db_queries": profile.count,
+            "db_ms": round(profile.duration * 1000, 1),
+        }
+        if repeated:
+            record["repeated"] = repeated
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Room for the non-file form fields and multipart boundaries
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """Bound size and concurrency of multipart (file upload) requests.
+
+    Requests whose Content-Length already exceeds the limit are rejected
+    before any body is read; chunked bodies are cut off with 413 as soon
+    as the received bytes pass it. At most ``max_concurrent`` uploads are
+    parsed and handled at a time; others wait briefly, then get 503.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, max_concurrent: int, wait_timeout: float):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.wait_timeout = wait_timeout
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = _header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await send_error(send, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, self._too_large_detail())
+            return
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            await send_error(
+                send,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Too many uploads in progress, please retry",
+                retry_after=1,
+            )
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised inside body parsing; FastAPI turns it into a 413
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=self._too_large_detail()
+                    )
+            return message
+
+        try:
+            await self.app(scope, limited_receive, send)
+        finally:
+            self._slots.release()
+
+    def _too_large_detail(self) -> str:
+        return f"File too large. Max size: {settings.MAX_UPLOAD_SIZE // (1024*1024)}MB"
+
+
+def _is_multipart(scope: Scope) -> bool:
+    content_type = _header(scope, b"content-type") or ""
+    return content_type.startswith("multipart/form-data")
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def send_error(send: Send, status_code: int, detail: str, retry_after: int | None = None) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if retry_after is not None:
+        headers.append((b"retry-after", str(retry_after).encode()))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
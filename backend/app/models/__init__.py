@@ -5,6 +5,9 @@ from app.models.claimed_prize import ClaimedPrize
 from app.models.test_question import TestQuestion
 from app.models.application import Application
 from app.models.event_settings import EventSettings
+from app.models.analytics_counter import AnalyticsCounter
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.revoked_token import RevokedToken
 from app.models.base import Base
 
 __all__ = [
@@ -16,5 +19,8 @@ __all__ = [
     "TestQuestion",
     "Application",
     "EventSettings",
+    "AnalyticsCounter",
+    "PointsLedgerEntry",
+    "RevokedToken",
 ]
 
@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class AnalyticsCounter(Base):
+    __tablename__ = "analytics_counters"
+    
+    # Each counter is split over several shard rows so that concurrent
+    # writers rarely wait on the same row lock; its value is the sum.
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
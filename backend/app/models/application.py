@@ -1,11 +1,15 @@
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, DateTime
+from sqlalchemy import String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Keyset pagination of the admin application list
+        Index("ix_applications_created_at_id", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True, nullable=False)
@@ -1,11 +1,15 @@
 from datetime import datetime
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 
 
 class ClaimedPrize(Base):
     __tablename__ = "claimed_prizes"
+    __table_args__ = (
+        # One claim per user and prize, enforced by the database
+        UniqueConstraint("user_id", "prize_id", name="uq_claimed_prizes_user_id_prize_id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
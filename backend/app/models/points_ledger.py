@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class PointsLedgerEntry(Base):
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        # Per-user history, newest first, by keyset
+        Index("ix_points_ledger_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    # Append-only: user_progress.points is the sum of a user's deltas
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str] = mapped_column(String(50), nullable=False)
+    reference: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
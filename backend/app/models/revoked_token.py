@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # A refresh token can be used (revoked) only once
+        UniqueConstraint("kind", "key", name="uq_revoked_tokens_kind_key"),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)  # 'token' (jti) | 'family' (login session) | 'user' (logout everywhere)
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # For 'token' rows: jti of the pair issued by the rotation, re-sent
+    # when the same token arrives again within REFRESH_REUSE_GRACE
+    successor: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # For 'user' rows this is the cutoff: tokens issued earlier are revoked
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    # After this the revoked tokens have expired anyway and the row is pruned
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
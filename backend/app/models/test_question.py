@@ -1,10 +1,14 @@
-from sqlalchemy import Integer, String, JSON
+from sqlalchemy import Integer, String, JSON, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
 
 class TestQuestion(Base):
     __tablename__ = "test_questions"
+    __table_args__ = (
+        # Natural key for bulk upserts
+        UniqueConstraint("question", name="uq_test_questions_question"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     question: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -1,14 +1,20 @@
 from datetime import datetime
-from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy import String, Boolean, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of the admin user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Emails are unique regardless of case; also serves login lookups
+        Index("uq_users_email_lower", text("lower(email)"), unique=True),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -32,3 +32,8 @@ class UserAnalytics(BaseModel):
     email: str
     registered_at: str
 
+
+
+class UserStatusUpdate(BaseModel):
+    is_active: bool | None = None
+    is_admin: bool | None = None
@@ -0,0 +1,27 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class BootstrapSection(BaseModel):
+    etag: str
+    # Omitted when the client already has this etag (sent in If-None-Match)
+    data: Any = None
+    not_modified: bool = False
+
+
+class BootstrapResponse(BaseModel):
+    """Everything the app needs on launch. Section data has the same shape
+    as the standalone endpoints:
+    
+    - user: GET /users/me
+    - claimed_prizes: GET /users/me/claimed-prizes
+    - application: GET /applications/me
+    - prizes: GET /prizes
+    - test_questions: GET /test/questions
+    """
+    user: BootstrapSection
+    claimed_prizes: BootstrapSection
+    application: BootstrapSection
+    prizes: BootstrapSection
+    test_questions: BootstrapSection
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class BulkRowResult(BaseModel):
+    row: int  # 1-based position in the batch (CSV: data line, header excluded)
+    key: str | None = None  # prize name / question text
+    status: str  # 'created' | 'updated' | 'invalid' | 'skipped' (batch rejected)
+    id: int | None = None
+    errors: list[str] = []
+
+
+class BulkImportResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    invalid: int = 0
+    results: list[BulkRowResult]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    name: str
+    points: int
+    is_me: bool = False
+
+
+class LeaderboardResponse(BaseModel):
+    entries: list[LeaderboardEntry]
+    participants: int
+
+
+class UserRankResponse(BaseModel):
+    rank: int | None
+    points: int | None
+    participants: int
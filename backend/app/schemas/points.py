@@ -0,0 +1,13 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class PointsLedgerEntryResponse(BaseModel):
+    id: int
+    delta: int
+    reason: str  # 'test_completed' | 'game_completed' | 'application_submitted' | 'prize_claimed' | 'opening_balance'
+    reference: str | None = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
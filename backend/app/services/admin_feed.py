@@ -0,0 +1,199 @@
+"""
+Live admin dashboard feed (GET /admin/stream).
+
+Domain events from this process become SSE events right away:
+``analytics`` (counter deltas), ``user`` and ``application`` (new rows)
+and ``prize_claimed``. While an admin is connected, a periodic sync
+reads the analytics counters and the newest users/applications by keyset
+(a few indexed rows) to pick up what other worker processes handled; it
+sends ``analytics_totals`` when the totals drifted and any rows not yet
+sent. New subscribers start with a ``snapshot`` of the totals.
+"""
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.sse import SSEHub
+from app.models.application import Application
+from app.models.user import User
+from app.schemas.application import ApplicationWithUser
+from app.services import analytics, events
+
+admin_hub = SSEHub(
+    "admin",
+    buffer_size=settings.SSE_BUFFER_SIZE,
+    heartbeat=settings.SSE_HEARTBEAT_INTERVAL,
+    max_subscribers=settings.SSE_MAX_CONNECTIONS,
+)
+
+# Analytics counter changed by each event type
+_COUNTER_DELTAS = {
+    events.USER_REGISTERED: (analytics.REGISTRATIONS, 1),
+    events.TEST_COMPLETED: (analytics.TESTS_COMPLETED, 1),
+    events.GAME_COMPLETED: (analytics.GAMES_COMPLETED, 1),
+    events.APPLICATION_SUBMITTED: (analytics.APPLICATIONS, 1),
+}
+
+# Totals as last sent to subscribers (snapshot + deltas)
+_totals: dict[str, int] = {}
+
+
+class _SentIds:
+    """Bounded set of row ids already pushed, so the sync skips them."""
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._ids: OrderedDict[int, None] = OrderedDict()
+
+    def add(self, row_id: int) -> bool:
+        """Remember ``row_id``; False if it was already sent."""
+        if row_id in self._ids:
+            return False
+        self._ids[row_id] = None
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return True
+
+
+_sent_users = _SentIds()
+_sent_applications = _SentIds()
+# Keyset position of the newest row seen by the sync: (created_at, id)
+_user_cursor: tuple[datetime, int] | None = None
+_application_cursor: tuple[datetime, int] | None = None
+
+
+def _publish_delta(name: str, delta: int) -> None:
+    if _totals:
+        _totals[name] = _totals.get(name, 0) + delta
+    admin_hub.publish("analytics", {name: delta})
+
+
+def _on_event(event_type: str, payload: dict) -> None:
+    if event_type in _COUNTER_DELTAS:
+        _publish_delta(*_COUNTER_DELTAS[event_type])
+
+    if event_type == events.USER_REGISTERED:
+        if _sent_users.add(payload["id"]):
+            admin_hub.publish("user", payload)
+    elif event_type == events.USER_ROLE_CHANGED:
+        # Admins are not counted as registrations
+        _publish_delta(analytics.REGISTRATIONS, -1 if payload["is_admin"] else 1)
+    elif event_type == events.APPLICATION_SUBMITTED:
+        if _sent_applications.add(payload["id"]):
+            admin_hub.publish("application", payload)
+    elif event_type == events.PRIZE_CLAIMED:
+        admin_hub.publish("prize_claimed", payload)
+
+
+events.event_bus.subscribe(
+    _on_event,
+    events.USER_REGISTERED,
+    events.USER_ROLE_CHANGED,
+    events.TEST_COMPLETED,
+    events.GAME_COMPLETED,
+    events.APPLICATION_SUBMITTED,
+    events.PRIZE_CLAIMED,
+)
+
+
+def user_payload(user_id: int, email: str, created_at: datetime) -> dict:
+    """A row of GET /admin/users plus the user id."""
+    return {"id": user_id, "email": email, "registered_at": created_at.isoformat()}
+
+
+def application_payload(application: Application, user_email: str) -> dict:
+    """A row of GET /admin/applications."""
+    return ApplicationWithUser(
+        id=application.id,
+        user_id=application.user_id,
+        full_name=application.full_name,
+        email=application.email,
+        phone=application.phone,
+        direction=application.direction,
+        motivation=application.motivation,
+        resume_path=application.resume_path,
+        created_at=application.created_at,
+        user_email=user_email
+    ).model_dump(mode="json")
+
+
+async def snapshot() -> dict:
+    async with async_session_maker() as db:
+        counters = await analytics.read_counters(db)
+    _totals.clear()
+    _totals.update(counters)
+    return {"analytics": counters}
+
+
+async def sync() -> None:
+    """Send what other workers changed since the last sync."""
+    global _user_cursor, _application_cursor
+
+    async with async_session_maker() as db:
+        counters = await analytics.read_counters(db)
+
+        users = select(User.id, User.email, User.created_at).where(User.is_admin == False)
+        applications = select(Application, User.email).join(User, Application.user_id == User.id)
+        if _user_cursor is not None:
+            users = users.where(tuple_(User.created_at, User.id) > tuple_(*_user_cursor))
+        if _application_cursor is not None:
+            applications = applications.where(
+                tuple_(Application.created_at, Application.id) > tuple_(*_application_cursor)
+            )
+        if _user_cursor is None:
+            # First sync: only find the newest row, send nothing
+            users = users.order_by(User.created_at.desc(), User.id.desc()).limit(1)
+        else:
+            users = users.order_by(User.created_at, User.id).limit(settings.ADMIN_PAGE_SIZE_MAX)
+        if _application_cursor is None:
+            applications = applications.order_by(
+                Application.created_at.desc(), Application.id.desc()
+            ).limit(1)
+        else:
+            applications = applications.order_by(
+                Application.created_at, Application.id
+            ).limit(settings.ADMIN_PAGE_SIZE_MAX)
+
+        user_rows = (await db.execute(users)).all()
+        application_rows = (await db.execute(applications)).all()
+
+    first_sync = _user_cursor is None
+    if first_sync and not user_rows:
+        _user_cursor = (datetime.min, 0)
+    for user_id, email, created_at in user_rows:
+        _user_cursor = (created_at, user_id)
+        if _sent_users.add(user_id) and not first_sync:
+            admin_hub.publish("user", user_payload(user_id, email, created_at))
+
+    first_sync = _application_cursor is None
+    if first_sync and not application_rows:
+        _application_cursor = (datetime.min, 0)
+    for application, user_email in application_rows:
+        _application_cursor = (application.created_at, application.id)
+        if _sent_applications.add(application.id) and not first_sync:
+            admin_hub.publish("application", application_payload(application, user_email))
+
+    if counters != _totals:
+        _totals.clear()
+        _totals.update(counters)
+        admin_hub.publish("analytics_totals", counters)
+
+
+async def sync_periodically() -> None:
+    global _user_cursor, _application_cursor
+
+    while True:
+        await asyncio.sleep(settings.ADMIN_STREAM_SYNC_INTERVAL)
+        if not admin_hub.subscribers:
+            # Nobody listening; start over when someone connects
+            _user_cursor = _application_cursor = None
+            continue
+        try:
+            await sync()
+        except Exception:
+            # Database hiccup: retry next tick
+            continue
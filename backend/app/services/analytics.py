@@ -0,0 +1,155 @@
+"""
+Incrementally maintained counters for the admin dashboard.
+Rebuild or verify with: python -m app.services.analytics rebuild|check
+"""
+import asyncio
+import random
+import sys
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.analytics_counter import AnalyticsCounter
+from app.models.application import Application
+from app.models.user import User
+from app.models.user_progress import UserProgress
+
+# Counter names
+REGISTRATIONS = "registrations"
+TESTS_COMPLETED = "tests_completed"
+GAMES_COMPLETED = "games_completed"
+APPLICATIONS = "applications"
+
+COUNTERS = (REGISTRATIONS, TESTS_COMPLETED, GAMES_COMPLETED, APPLICATIONS)
+
+
+async def increment(db: AsyncSession, name: str, delta: int = 1) -> None:
+    """Add ``delta`` to a counter as part of the caller's transaction.
+
+    Call it right before the commit so the counter row is locked for as
+    short a time as possible. The rows are created at startup by
+    ``ensure_counters``.
+    """
+    shard = random.randrange(max(settings.ANALYTICS_COUNTER_SHARDS, 1))
+    result = await db.execute(
+        update(AnalyticsCounter)
+        .where(AnalyticsCounter.name == name, AnalyticsCounter.shard == shard)
+        .values(value=AnalyticsCounter.value + delta)
+    )
+    if result.rowcount == 0 and shard != 0:
+        # Shard rows not created yet (e.g. shard count was raised)
+        await db.execute(
+            update(AnalyticsCounter)
+            .where(AnalyticsCounter.name == name, AnalyticsCounter.shard == 0)
+            .values(value=AnalyticsCounter.value + delta)
+        )
+
+
+async def read_counters(db: AsyncSession) -> dict[str, int]:
+    """Current counter values (read-only; missing counters read as 0)."""
+    result = await db.execute(
+        select(AnalyticsCounter.name, func.sum(AnalyticsCounter.value))
+        .group_by(AnalyticsCounter.name)
+    )
+    values = {name: int(total or 0) for name, total in result.all()}
+    return {name: values.get(name, 0) for name in COUNTERS}
+
+
+async def ensure_counters(db: AsyncSession) -> None:
+    """Create missing counter rows, shard 0 starting from the source tables.
+
+    Run at startup. Existing rows are left alone (ON CONFLICT DO
+    NOTHING), so several workers starting at once cannot collide.
+    """
+    shards = max(settings.ANALYTICS_COUNTER_SHARDS, 1)
+    result = await db.execute(select(func.count()).select_from(AnalyticsCounter))
+    if result.scalar_one() >= len(COUNTERS) * shards:
+        return
+
+    actual = await count_actual(db)
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    await db.execute(
+        dialect.insert(AnalyticsCounter)
+        .values([
+            {"name": name, "shard": shard, "value": actual[name] if shard == 0 else 0}
+            for name in COUNTERS
+            for shard in range(shards)
+        ])
+        .on_conflict_do_nothing()
+    )
+    await db.commit()
+
+
+async def count_actual(db: AsyncSession) -> dict[str, int]:
+    """Count everything from the source tables (O(n), used for rebuild/check)."""
+    result = await db.execute(
+        select(
+            select(func.count(User.id)).where(User.is_admin == False).scalar_subquery(),
+            select(func.count(UserProgress.id)).where(UserProgress.completed_test == True).scalar_subquery(),
+            select(func.count(UserProgress.id)).where(UserProgress.completed_game == True).scalar_subquery(),
+            select(func.count(Application.id)).scalar_subquery(),
+        )
+    )
+    row = result.one()
+    return dict(zip(COUNTERS, (value or 0 for value in row)))
+
+
+async def rebuild(db: AsyncSession) -> dict[str, int]:
+    """Recount from the source tables and replace all counter rows.
+
+    Writes committed while the recount runs may be missed; run it when
+    traffic is quiet and confirm with ``check``.
+    """
+    actual = await count_actual(db)
+    await db.execute(delete(AnalyticsCounter))
+    await db.execute(
+        insert(AnalyticsCounter),
+        [
+            {"name": name, "shard": shard, "value": actual[name] if shard == 0 else 0}
+            for name in COUNTERS
+            for shard in range(max(settings.ANALYTICS_COUNTER_SHARDS, 1))
+        ],
+    )
+    await db.commit()
+    return actual
+
+
+async def check(db: AsyncSession) -> dict[str, dict]:
+    """Compare counters with real counts."""
+    counters = await read_counters(db)
+    actual = await count_actual(db)
+    return {
+        name: {
+            "counter": counters[name],
+            "actual": actual[name],
+            "consistent": counters[name] == actual[name],
+        }
+        for name in COUNTERS
+    }
+
+
+async def main(command: str) -> int:
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as session:
+        if command == "rebuild":
+            values = await rebuild(session)
+            for name, value in values.items():
+                print(f"✓ {name} = {value}")
+            return 0
+
+        if command == "check":
+            report = await check(session)
+            for name, item in report.items():
+                mark = "✓" if item["consistent"] else "✗"
+                print(f"{mark} {name}: counter={item['counter']} actual={item['actual']}")
+            return 0 if all(item["consistent"] for item in report.values()) else 1
+
+    print("Usage: python -m app.services.analytics rebuild|check")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "")))
@@ -0,0 +1,201 @@
+"""
+Bulk upsert of prizes and test questions.
+
+A batch is validated as a whole; if any row is invalid nothing is
+written. Valid batches are applied with a single INSERT ... ON CONFLICT
+DO UPDATE statement keyed by prize name / question text.
+"""
+import csv
+import io
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.prize import Prize
+from app.models.test_question import TestQuestion
+from app.schemas.bulk import BulkImportResponse, BulkRowResult
+from app.schemas.prize import PrizeCreate
+from app.schemas.test import TestQuestionCreate
+
+
+class BulkImportError(Exception):
+    """Malformed input that cannot be split into rows (e.g. bad CSV header)."""
+
+
+def _insert(db: AsyncSession, model):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise BulkImportError(f"Bulk upsert is not supported on {dialect}")
+
+
+def _validate(
+    rows: list[dict[str, Any]],
+    schema: type[BaseModel],
+    key_field: str,
+) -> tuple[list[BaseModel], list[BulkRowResult]]:
+    """Validate every row and reject duplicate keys within the batch."""
+    items: list[BaseModel] = []
+    results: list[BulkRowResult] = []
+    seen: dict[str, int] = {}
+
+    for number, row in enumerate(rows, start=1):
+        try:
+            item = schema.model_validate(row)
+        except ValidationError as exc:
+            key = row.get(key_field) if isinstance(row, dict) else None
+            results.append(BulkRowResult(
+                row=number,
+                key=str(key) if key is not None else None,
+                status="invalid",
+                errors=[
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                    for error in exc.errors()
+                ],
+            ))
+            continue
+
+        key = getattr(item, key_field)
+        if key in seen:
+            results.append(BulkRowResult(
+                row=number, key=key, status="invalid",
+                errors=[f"{key_field}: duplicate of row {seen[key]}"],
+            ))
+            continue
+        seen[key] = number
+        items.append(item)
+        results.append(BulkRowResult(row=number, key=key, status="valid"))
+
+    return items, results
+
+
+async def _upsert(
+    db: AsyncSession,
+    model,
+    key_column,
+    values: list[dict[str, Any]],
+    results: list[BulkRowResult],
+) -> BulkImportResponse:
+    stmt = _insert(db, model).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key_column],
+        set_={
+            column: stmt.excluded[column]
+            for column in values[0]
+            if column != key_column.key
+        },
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        # A freshly inserted row version has no deleting transaction (xmax = 0)
+        rows = await db.execute(stmt.returning(model.id, key_column, literal_column("xmax = 0")))
+        applied = {key: (id_, created) for id_, key, created in rows.all()}
+    else:
+        # SQLite's RETURNING cannot tell inserts from updates: read the existing keys first
+        keys = [row[key_column.key] for row in values]
+        existing = await db.execute(select(key_column).where(key_column.in_(keys)))
+        existing_keys = set(existing.scalars().all())
+        rows = await db.execute(stmt.returning(model.id, key_column))
+        applied = {key: (id_, key not in existing_keys) for id_, key in rows.all()}
+
+    response = BulkImportResponse(results=results)
+    for result in results:
+        result.id, created = applied[result.key]
+        result.status = "created" if created else "updated"
+        if result.status == "created":
+            response.created += 1
+        else:
+            response.updated += 1
+    return response
+
+
+def _rejected(results: list[BulkRowResult]) -> BulkImportResponse:
+    for result in results:
+        if result.status == "valid":
+            # Valid but not applied, because the batch was rejected
+            result.status = "skipped"
+    return BulkImportResponse(
+        invalid=sum(result.status == "invalid" for result in results),
+        results=results,
+    )
+
+
+async def upsert_prizes(db: AsyncSession, rows: list[dict[str, Any]]) -> BulkImportResponse:
+    """Create or update prizes by name. Does not commit."""
+    items, results = _validate(rows, PrizeCreate, "name")
+    if len(items) != len(results) or not items:
+        return _rejected(results)
+    return await _upsert(db, Prize, Prize.name, [item.model_dump() for item in items], results)
+
+
+async def upsert_questions(db: AsyncSession, rows: list[dict[str, Any]]) -> BulkImportResponse:
+    """Create or update test questions by question text. Does not commit."""
+    items, results = _validate(rows, TestQuestionCreate, "question")
+    if len(items) != len(results) or not items:
+        return _rejected(results)
+    values = [
+        {
+            "question": item.question,
+            "options": [option.model_dump() for option in item.options],
+            "order": item.order,
+        }
+        for item in items
+    ]
+    return await _upsert(db, TestQuestion, TestQuestion.question, values, results)
+
+
+# ============== CSV ==============
+
+class _SemicolonDialect(csv.excel):
+    delimiter = ";"
+
+
+csv.register_dialect("excel-semicolon", _SemicolonDialect)
+
+
+def _read_csv(content: bytes, required: set[str]) -> list[dict[str, str]]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise BulkImportError("CSV must be UTF-8 encoded")
+    # Excel in ru locale saves with ';'
+    dialect = "excel"
+    first_line = text.partition("\n")[0]
+    if first_line.count(";") > first_line.count(","):
+        dialect = "excel-semicolon"
+    reader = csv.DictReader(io.StringIO(text), dialect=dialect)
+    missing = required - set(reader.fieldnames or [])
+    if missing:
+        raise BulkImportError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+    # Blank cells count as "not provided" so schema defaults apply
+    return [
+        {name: value for name, value in row.items() if name and value not in ("", None)}
+        for row in reader
+    ]
+
+
+def parse_prizes_csv(content: bytes) -> list[dict[str, Any]]:
+    """Columns: name, points, quantity, description."""
+    return _read_csv(content, {"name", "points"})
+
+
+def parse_questions_csv(content: bytes) -> list[dict[str, Any]]:
+    """Columns: question, order, option_1_text, option_1_type, option_2_text, ..."""
+    rows = []
+    for row in _read_csv(content, {"question", "option_1_text", "option_1_type"}):
+        options = []
+        number = 1
+        while f"option_{number}_text" in row or f"option_{number}_type" in row:
+            options.append({
+                "text": row.pop(f"option_{number}_text", None),
+                "type": row.pop(f"option_{number}_type", None),
+            })
+            number += 1
+        row["options"] = options
+        rows.append(row)
+    return rows
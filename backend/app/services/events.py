@@ -0,0 +1,51 @@
+"""
+In-process domain event bus.
+
+Routers emit an event after their transaction commits; features that
+react to it (live feeds, caches) subscribe here instead of being called
+from every router. Handlers run synchronously in the emitting request and
+must be cheap; a failing handler is logged and does not affect the
+request or other handlers.
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Event types and their payloads
+USER_REGISTERED = "user.registered"  # {"id", "email", "registered_at"}
+USER_ROLE_CHANGED = "user.role_changed"  # {"id", "is_admin"}
+TEST_COMPLETED = "test.completed"  # {"user_id", "result"} (result None if skipped)
+GAME_COMPLETED = "game.completed"  # {"user_id", "game_type", "points_earned"}
+APPLICATION_SUBMITTED = "application.submitted"  # ApplicationWithUser fields
+PRIZE_CLAIMED = "prize.claimed"  # {"user_id", "prize_id", "prize_name", "remaining_quantity"}
+PRIZE_UPDATED = "prize.updated"  # {"prize_id", "quantity"}
+PRIZE_REMOVED = "prize.removed"  # {"prize_id"}
+
+Handler = Callable[[str, dict[str, Any]], None]
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._catch_all: list[Handler] = []
+
+    def subscribe(self, handler: Handler, *event_types: str) -> Handler:
+        """Call ``handler(event_type, payload)`` for the given types (all if none)."""
+        if not event_types:
+            self._catch_all.append(handler)
+        for event_type in event_types:
+            self._handlers[event_type].append(handler)
+        return handler
+
+    def emit(self, event_type: str, payload: dict[str, Any]) -> None:
+        for handler in (*self._handlers.get(event_type, ()), *self._catch_all):
+            try:
+                handler(event_type, payload)
+            except Exception:
+                logger.exception("Event handler %r failed for %s", handler, event_type)
+
+
+event_bus = EventBus()
+emit = event_bus.emit
@@ -0,0 +1,132 @@
+import csv
+import io
+import os
+import tempfile
+from datetime import date, timedelta
+from typing import AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.application import Application
+from app.models.user import User
+
+# Column order of exported files
+EXPORT_COLUMNS = [
+    "id",
+    "user_id",
+    "full_name",
+    "email",
+    "phone",
+    "direction",
+    "motivation",
+    "resume_path",
+    "created_at",
+    "user_email",
+]
+
+
+def build_applications_query(
+    direction: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Select:
+    """Applications joined with the user email, oldest first."""
+    query = (
+        select(
+            Application.id,
+            Application.user_id,
+            Application.full_name,
+            Application.email,
+            Application.phone,
+            Application.direction,
+            Application.motivation,
+            Application.resume_path,
+            Application.created_at,
+            User.email.label("user_email"),
+        )
+        .join(User, Application.user_id == User.id)
+        .order_by(Application.created_at, Application.id)
+    )
+    if direction:
+        query = query.where(Application.direction == direction)
+    if date_from:
+        query = query.where(Application.created_at >= date_from)
+    if date_to:
+        # date_to is inclusive
+        query = query.where(Application.created_at < date_to + timedelta(days=1))
+    return query
+
+
+async def iter_batches(query: Select) -> AsyncIterator[list]:
+    """Yield result rows in batches from a server-side cursor.
+
+    Uses its own session: the request session is closed before a
+    streaming response body is sent.
+    """
+    async with async_session_maker() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            yield batch
+
+
+async def csv_chunks(query: Select) -> AsyncIterator[bytes]:
+    """Stream the query result as UTF-8 CSV, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens Cyrillic text correctly
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+
+    async for batch in iter_batches(query):
+        writer.writerows(
+            [*row[:-2], row.created_at.isoformat(sep=" ", timespec="seconds"), row.user_email]
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_available() -> bool:
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def write_xlsx(query: Select) -> str:
+    """Write the query result to a temporary XLSX file and return its path.
+
+    openpyxl's write-only mode keeps memory flat; all workbook calls run
+    in the thread pool so the event loop stays free.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Applications")
+    await run_in_threadpool(sheet.append, EXPORT_COLUMNS)
+
+    def append_rows(rows: list) -> None:
+        for row in rows:
+            sheet.append(list(row))
+
+    async for batch in iter_batches(query):
+        await run_in_threadpool(append_rows, batch)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        await run_in_threadpool(workbook.save, path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
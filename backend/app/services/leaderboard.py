@@ -0,0 +1,224 @@
+import asyncio
+import heapq
+from bisect import bisect_left, insort
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.principal_cache import Principal
+from app.models.user import User
+from app.models.user_progress import UserProgress
+
+
+class RankIndex:
+    """Users ranked by points with O(log n) updates and rank lookups.
+
+    A Fenwick tree counts users per point value, so "how many users have
+    more points than p" is a prefix sum. Users sharing a value live in a
+    bucket; the sorted list of distinct values drives top-N listings.
+    Ranks are competition ranks: equal points share a rank (1, 2, 2, 4).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._tree = [0] * (capacity + 1)
+        self._points: dict[int, int] = {}
+        self._buckets: dict[int, set[int]] = {}
+        self._values: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._points
+
+    def set(self, user_id: int, points: int) -> None:
+        old = self._points.get(user_id)
+        if old == points:
+            return
+        if old is not None:
+            self.remove(user_id)
+        points = max(points, 0)
+        if points + 1 >= len(self._tree):
+            self._grow(points + 1)
+
+        self._points[user_id] = points
+        bucket = self._buckets.get(points)
+        if bucket is None:
+            bucket = self._buckets[points] = set()
+            insort(self._values, points)
+        bucket.add(user_id)
+        self._add(points, 1)
+
+    def remove(self, user_id: int) -> None:
+        points = self._points.pop(user_id, None)
+        if points is None:
+            return
+        bucket = self._buckets[points]
+        bucket.discard(user_id)
+        if not bucket:
+            del self._buckets[points]
+            del self._values[bisect_left(self._values, points)]
+        self._add(points, -1)
+
+    def points(self, user_id: int) -> int | None:
+        return self._points.get(user_id)
+
+    def rank_of_points(self, points: int) -> int:
+        """Rank a user with ``points`` would have."""
+        if points + 1 >= len(self._tree):
+            return 1
+        return len(self._points) - self._prefix(max(points, 0)) + 1
+
+    def rank(self, user_id: int) -> int | None:
+        points = self._points.get(user_id)
+        return None if points is None else self.rank_of_points(points)
+
+    def top(self, limit: int) -> list[tuple[int, int, int]]:
+        """``(rank, user_id, points)`` for the best ``limit`` users.
+
+        Ties are ordered by user id (earlier registration first).
+        """
+        entries: list[tuple[int, int, int]] = []
+        above = 0
+        for points in reversed(self._values):
+            if len(entries) >= limit:
+                break
+            bucket = self._buckets[points]
+            for user_id in heapq.nsmallest(limit - len(entries), bucket):
+                entries.append((above + 1, user_id, points))
+            above += len(bucket)
+        return entries
+
+    def _add(self, points: int, delta: int) -> None:
+        i = points + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, points: int) -> int:
+        """Number of users with at most ``points``."""
+        total = 0
+        i = points + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._tree) - 1
+        while capacity <= needed:
+            capacity *= 2
+        self._tree = [0] * (capacity + 1)
+        for points, bucket in self._buckets.items():
+            self._add(points, len(bucket))
+
+
+class Leaderboard:
+    """Process-local ranking of non-admin users by points.
+
+    Handlers call ``record`` after committing a balance change, so
+    lookups never touch the database. Changes made by other worker
+    processes show up after the next periodic ``reload``.
+    """
+
+    def __init__(self):
+        self._index = RankIndex()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Updates that arrive while a reload is reading the table
+        self._pending: dict[int, int | None] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def record(self, user: Principal, points: int) -> None:
+        """Apply a committed balance change (admins are not ranked)."""
+        if not user.is_admin:
+            self.set_points(user.id, points)
+
+    def set_points(self, user_id: int, points: int) -> None:
+        if self._pending is not None:
+            self._pending[user_id] = points
+        self._index.set(user_id, points)
+
+    def remove(self, user_id: int) -> None:
+        if self._pending is not None:
+            self._pending[user_id] = None
+        self._index.remove(user_id)
+
+    async def reload(self, force: bool = True) -> None:
+        """Rebuild the index from ``user_progress`` (one indexed read).
+
+        With ``force=False`` nothing is read if the index got loaded while
+        waiting for the lock, so concurrent first requests share one load.
+        """
+        async with self._lock:
+            if not force and self._loaded:
+                return
+            self._pending = {}
+            try:
+                async with async_session_maker() as db:
+                    result = await db.execute(
+                        select(UserProgress.user_id, UserProgress.points)
+                        .join(User, User.id == UserProgress.user_id)
+                        .where(User.is_admin == False)
+                    )
+                    rows = result.all()
+
+                index = RankIndex()
+                for user_id, points in rows:
+                    index.set(user_id, points)
+                for user_id, points in self._pending.items():
+                    if points is None:
+                        index.remove(user_id)
+                    else:
+                        index.set(user_id, points)
+                self._index = index
+                self._loaded = True
+            finally:
+                self._pending = None
+
+    async def ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.reload(force=False)
+
+    async def refresh_user(self, db: AsyncSession, user_id: int) -> None:
+        """Re-read one user, e.g. after their admin flag changed."""
+        result = await db.execute(
+            select(UserProgress.points, User.is_admin)
+            .join(User, User.id == UserProgress.user_id)
+            .where(UserProgress.user_id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None or row.is_admin:
+            self.remove(user_id)
+        else:
+            self.set_points(user_id, row.points)
+
+    def top(self, limit: int) -> list[tuple[int, int, int]]:
+        return self._index.top(limit)
+
+    def rank(self, user_id: int) -> tuple[int | None, int | None]:
+        """``(rank, points)``; both None if the user is not ranked."""
+        return self._index.rank(user_id), self._index.points(user_id)
+
+    @property
+    def participants(self) -> int:
+        return len(self._index)
+
+
+leaderboard = Leaderboard()
+
+
+async def refresh_periodically() -> None:
+    """Pick up balance changes made by other worker processes."""
+    while True:
+        await asyncio.sleep(settings.LEADERBOARD_REFRESH_INTERVAL)
+        try:
+            await leaderboard.reload()
+        except Exception:
+            # Database hiccup: keep serving the current index, retry next tick
+            continue
@@ -0,0 +1,146 @@
+"""
+Append-only points ledger.
+
+Every change of a balance is recorded as a ledger row in the same
+transaction that updates ``user_progress.points``, which is kept as the
+materialized sum of the user's deltas. Verify, backfill or rebuild with:
+python -m app.services.points_ledger check|backfill|rebuild
+"""
+import asyncio
+import sys
+
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.user_progress import UserProgress
+from app.schemas.pagination import Page
+from app.schemas.points import PointsLedgerEntryResponse
+
+# Reasons
+TEST_COMPLETED = "test_completed"
+GAME_COMPLETED = "game_completed"
+APPLICATION_SUBMITTED = "application_submitted"
+PRIZE_CLAIMED = "prize_claimed"
+OPENING_BALANCE = "opening_balance"  # balance that predates the ledger (backfill)
+
+
+async def record(db: AsyncSession, user_id: int, delta: int, reason: str, reference: str | None = None) -> None:
+    """Append a ledger row as part of the caller's transaction."""
+    await db.execute(
+        insert(PointsLedgerEntry).values(user_id=user_id, delta=delta, reason=reason, reference=reference)
+    )
+
+
+async def history(db: AsyncSession, user_id: int, cursor: str | None, limit: int) -> Page[PointsLedgerEntryResponse]:
+    """A page of a user's ledger, newest first."""
+    query = (
+        select(PointsLedgerEntry)
+        .where(PointsLedgerEntry.user_id == user_id)
+        .order_by(PointsLedgerEntry.created_at.desc(), PointsLedgerEntry.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(
+            tuple_(PointsLedgerEntry.created_at, PointsLedgerEntry.id) < tuple_(*decode_cursor(cursor))
+        )
+
+    result = await db.execute(query)
+    entries = result.scalars().all()
+
+    # One extra row tells whether another page exists
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].created_at, entries[-1].id)
+
+    return Page[PointsLedgerEntryResponse](
+        items=[PointsLedgerEntryResponse.model_validate(entry) for entry in entries],
+        next_cursor=next_cursor
+    )
+
+
+def _ledger_sum():
+    return (
+        select(func.coalesce(func.sum(PointsLedgerEntry.delta), 0))
+        .where(PointsLedgerEntry.user_id == UserProgress.user_id)
+        .scalar_subquery()
+    )
+
+
+async def mismatches(db: AsyncSession) -> list[tuple[int, int, int]]:
+    """(user_id, balance, ledger sum) for every balance that differs from its ledger."""
+    ledger_sum = _ledger_sum()
+    result = await db.execute(
+        select(UserProgress.user_id, UserProgress.points, ledger_sum)
+        .where(UserProgress.points != ledger_sum)
+        .order_by(UserProgress.user_id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def backfill(db: AsyncSession) -> int:
+    """Add an opening-balance row for every balance the ledger does not explain.
+
+    For balances that existed before the ledger; afterwards ``check`` passes
+    without changing any balance. Returns the number of rows added.
+    """
+    rows = await mismatches(db)
+    if rows:
+        await db.execute(
+            insert(PointsLedgerEntry),
+            [
+                {"user_id": user_id, "delta": points - total, "reason": OPENING_BALANCE}
+                for user_id, points, total in rows
+            ],
+        )
+    await db.commit()
+    return len(rows)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Set every balance to the sum of its ledger in one statement.
+
+    Returns the number of balances that changed. Run ``backfill`` first
+    on a database that has balances from before the ledger.
+    """
+    ledger_sum = _ledger_sum()
+    result = await db.execute(
+        update(UserProgress)
+        .where(UserProgress.points != ledger_sum)
+        .values(points=ledger_sum)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def main(command: str) -> int:
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as session:
+        if command == "check":
+            rows = await mismatches(session)
+            for user_id, points, total in rows[:20]:
+                print(f"✗ user {user_id}: balance={points} ledger={total}")
+            if len(rows) > 20:
+                print(f"… and {len(rows) - 20} more")
+            if not rows:
+                print("✓ all balances match the ledger")
+            return 1 if rows else 0
+
+        if command == "backfill":
+            print(f"✓ {await backfill(session)} opening balance rows added")
+            return 0
+
+        if command == "rebuild":
+            print(f"✓ {await rebuild(session)} balances updated from the ledger")
+            return 0
+
+    print("Usage: python -m app.services.points_ledger check|backfill|rebuild")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "")))
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+
+from fastapi import status
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.claimed_prize import ClaimedPrize
+from app.models.prize import Prize
+from app.models.user_progress import UserProgress
+from app.services import points_ledger
+
+
+class PrizeClaimError(Exception):
+    """Raised when a claim is rejected; carries the reason for the client."""
+
+    def __init__(self, reason: str, detail: str, status_code: int = status.HTTP_400_BAD_REQUEST):
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+        self.status_code = status_code
+
+
+@dataclass
+class ClaimResult:
+    prize_id: int
+    prize_name: str
+    remaining_points: int
+    remaining_quantity: int
+
+
+async def claim(db: AsyncSession, user_id: int, prize_id: int) -> ClaimResult:
+    """Claim a prize in a single transaction using conditional updates.
+
+    Every check is part of a write statement, so concurrent claims can
+    neither oversell stock nor spend the same points twice:
+
+    1. points are deducted only if the balance covers the prize cost,
+       and the spend is written to the points ledger (the cost is read
+       back from the deduction, so the row matches what was taken even
+       if an admin reprices the prize meanwhile);
+    2. the claim row is inserted under the (user_id, prize_id) unique
+       constraint;
+    3. stock is decremented only while quantity > 0.
+
+    The hot prize row is touched last so its lock is held only for the
+    final statement and the commit.
+    """
+    prize_cost = select(Prize.points).where(Prize.id == prize_id).scalar_subquery()
+
+    # 1. Deduct points if the balance is enough
+    result = await db.execute(
+        update(UserProgress)
+        .where(
+            UserProgress.user_id == user_id,
+            UserProgress.points >= prize_cost,
+        )
+        .values(points=UserProgress.points - prize_cost)
+        .returning(UserProgress.points, prize_cost.label("cost"))
+    )
+    deducted = result.one_or_none()
+    if deducted is None:
+        await db.rollback()
+        raise await _diagnose(db, user_id, prize_id)
+    remaining_points = deducted.points
+    await points_ledger.record(db, user_id, -deducted.cost, points_ledger.PRIZE_CLAIMED, f"prize:{prize_id}")
+
+    # 2. Record the claim; the unique constraint rejects a second one
+    try:
+        await db.execute(insert(ClaimedPrize).values(user_id=user_id, prize_id=prize_id))
+    except IntegrityError:
+        await db.rollback()
+        raise PrizeClaimError("already_claimed", "Prize already claimed")
+
+    # 3. Take one unit of stock if any is left
+    result = await db.execute(
+        update(Prize)
+        .where(Prize.id == prize_id, Prize.quantity > 0)
+        .values(quantity=Prize.quantity - 1)
+        .returning(Prize.name, Prize.quantity)
+    )
+    row = result.one_or_none()
+    if row is None:
+        await db.rollback()
+        raise PrizeClaimError("out_of_stock", "Prize is out of stock")
+
+    await db.commit()
+
+    return ClaimResult(
+        prize_id=prize_id,
+        prize_name=row.name,
+        remaining_points=remaining_points,
+        remaining_quantity=row.quantity,
+    )
+
+
+async def _diagnose(db: AsyncSession, user_id: int, prize_id: int) -> PrizeClaimError:
+    """Work out why the points deduction matched no row (slow path only)."""
+    result = await db.execute(select(Prize.points, Prize.quantity).where(Prize.id == prize_id))
+    prize = result.one_or_none()
+    if prize is None:
+        return PrizeClaimError("prize_not_found", "Prize not found", status.HTTP_404_NOT_FOUND)
+    if prize.quantity <= 0:
+        return PrizeClaimError("out_of_stock", "Prize is out of stock")
+
+    result = await db.execute(select(UserProgress.points).where(UserProgress.user_id == user_id))
+    points = result.scalar_one_or_none()
+    if points is None:
+        return PrizeClaimError("no_progress", "User has no points")
+
+    return PrizeClaimError(
+        "not_enough_points",
+        f"Not enough points. Need {prize.points}, have {points}",
+    )
@@ -0,0 +1,98 @@
+"""
+Live prize stock feed (GET /prizes/stream).
+
+Prize events from the event bus (claims, admin edits) are published to
+the process-local SSE hub as they happen. A periodic sync compares the
+prizes table with the last published quantities, so changes made by
+other worker processes reach this worker's subscribers too.
+"""
+import asyncio
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.response_cache import PRIZES, response_cache
+from app.core.sse import SSEHub
+from app.models.prize import Prize
+from app.schemas.prize import PrizeResponse
+from app.services import events
+
+prize_list_adapter = TypeAdapter(list[PrizeResponse])
+
+stock_hub = SSEHub(
+    "prize_stock",
+    buffer_size=settings.SSE_BUFFER_SIZE,
+    heartbeat=settings.SSE_HEARTBEAT_INTERVAL,
+    max_subscribers=settings.SSE_MAX_CONNECTIONS,
+)
+
+# prize id -> last published quantity
+_known: dict[int, int] = {}
+
+
+async def load_prize_list(db: AsyncSession) -> bytes:
+    """All prizes ordered by points, as the JSON body of GET /prizes."""
+    result = await db.execute(
+        select(Prize).order_by(Prize.points)
+    )
+    prizes = prize_list_adapter.validate_python(result.scalars().all(), from_attributes=True)
+    return prize_list_adapter.dump_json(prizes)
+
+
+async def snapshot() -> bytes:
+    """Full prize list for new subscribers (shared with GET /prizes cache)."""
+    async with async_session_maker() as db:
+        entry = await response_cache.get_or_load(PRIZES, lambda: load_prize_list(db))
+    return entry.body
+
+
+def publish_stock(prize_id: int, quantity: int) -> None:
+    if _known.get(prize_id) == quantity:
+        return
+    _known[prize_id] = quantity
+    stock_hub.publish("stock", {"id": prize_id, "quantity": quantity})
+
+
+def publish_removed(prize_id: int) -> None:
+    _known.pop(prize_id, None)
+    stock_hub.publish("removed", {"id": prize_id})
+
+
+def _on_event(event_type: str, payload: dict) -> None:
+    if event_type == events.PRIZE_REMOVED:
+        publish_removed(payload["prize_id"])
+    elif event_type == events.PRIZE_CLAIMED:
+        publish_stock(payload["prize_id"], payload["remaining_quantity"])
+    else:
+        publish_stock(payload["prize_id"], payload["quantity"])
+
+
+events.event_bus.subscribe(_on_event, events.PRIZE_CLAIMED, events.PRIZE_UPDATED, events.PRIZE_REMOVED)
+
+
+async def sync_stock() -> None:
+    """Publish differences between the database and what was last sent."""
+    async with async_session_maker() as db:
+        result = await db.execute(select(Prize.id, Prize.quantity))
+        current = dict(result.all())
+    for prize_id in set(_known) - set(current):
+        publish_removed(prize_id)
+    for prize_id, quantity in current.items():
+        publish_stock(prize_id, quantity)
+
+
+async def sync_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.PRIZE_STOCK_SYNC_INTERVAL)
+        if not stock_hub.subscribers:
+            # Nobody listening; the next subscriber starts from a snapshot
+            _known.clear()
+            continue
+        try:
+            await sync_stock()
+        except Exception:
+            # Database hiccup: retry next tick
+            continue
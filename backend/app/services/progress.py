@@ -0,0 +1,61 @@
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models.user_progress import UserProgress
+from app.services import points_ledger
+
+
+async def award(
+    db: AsyncSession,
+    user_id: int,
+    points: int,
+    reason: str,
+    reference: str | None = None,
+    once: InstrumentedAttribute[bool] | None = None,
+    **values: Any,
+) -> int | None:
+    """Add ``points`` (and set ``values``) in one conditional UPDATE.
+
+    With ``once`` (e.g. ``UserProgress.completed_game``) the row only
+    matches while that flag is false, and the same statement sets it, so
+    of two concurrent requests exactly one gets the points: the other
+    waits on the row lock and then matches nothing. Returns the new
+    balance, or None if ``once`` was already set. Part of the caller's
+    transaction; one round trip for the balance plus the ledger insert
+    (skipped for zero points), more only if the progress row is missing.
+    """
+    conditions = [UserProgress.user_id == user_id]
+    if once is not None:
+        conditions.append(once == False)
+        values[once.key] = True
+
+    statement = (
+        update(UserProgress)
+        .where(*conditions)
+        .values(points=UserProgress.points + points, **values)
+        .returning(UserProgress.points)
+    )
+    total = (await db.execute(statement)).scalar_one_or_none()
+    if total is None and await _create_missing(db, user_id):
+        total = (await db.execute(statement)).scalar_one_or_none()
+    if total is not None and points:
+        await points_ledger.record(db, user_id, points, reason, reference)
+    return total
+
+
+async def _create_missing(db: AsyncSession, user_id: int) -> bool:
+    """Create the progress row if there is none (slow path only); False if it existed."""
+    result = await db.execute(select(UserProgress.id).where(UserProgress.user_id == user_id))
+    if result.scalar_one_or_none() is not None:
+        return False
+    try:
+        async with db.begin_nested():
+            db.add(UserProgress(user_id=user_id))
+    except IntegrityError:
+        # Created by a concurrent request
+        pass
+    return True
@@ -0,0 +1,75 @@
+"""
+Single-statement user registration.
+
+On PostgreSQL the user and its progress row are created by one
+statement: a data-modifying CTE ``INSERT INTO users ... ON CONFLICT DO
+NOTHING RETURNING id`` feeding ``INSERT INTO user_progress``. A taken
+email (checked by the unique index on ``lower(email)``) inserts nothing
+in either table, so concurrent sign-ups with the same email cannot race
+into an IntegrityError. SQLite has no DML in CTEs, so there the same
+two inserts run as two statements of one transaction.
+"""
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.user_progress import UserProgress
+
+
+def normalize_email(email: str) -> str:
+    """Canonical form stored in ``users.email`` and used for lookups."""
+    return email.strip().lower()
+
+
+def by_email(email: str):
+    """SELECT of the user with this email, whatever its case (uses the lower(email) index)."""
+    return select(User).where(func.lower(User.email) == normalize_email(email))
+
+
+async def create_user(
+    db: AsyncSession,
+    email: str,
+    hashed_password: str,
+    created_at: datetime,
+) -> int | None:
+    """Insert a user with an empty progress row; the new user id, or None if the email is taken.
+
+    Part of the caller's transaction.
+    """
+    values = {
+        "email": normalize_email(email),
+        "hashed_password": hashed_password,
+        "is_admin": False,
+        "is_active": True,
+        "created_at": created_at,
+    }
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        new_user = (
+            postgresql.insert(User)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(User.id)
+            .cte("new_user")
+        )
+        result = await db.execute(
+            insert(UserProgress)
+            .from_select(["user_id"], select(new_user.c.id))
+            .returning(UserProgress.user_id)
+        )
+        return result.scalar_one_or_none()
+
+    result = await db.execute(
+        sqlite.insert(User)
+        .values(**values)
+        .on_conflict_do_nothing()
+        .returning(User.id)
+    )
+    user_id = result.scalar_one_or_none()
+    if user_id is not None:
+        await db.execute(insert(UserProgress).values(user_id=user_id))
+    return user_id
@@ -6,13 +6,14 @@ import asyncio
 from sqlalchemy import select
 
 from app.core.database import async_session_maker, engine
-from app.core.security import get_password_hash
+from app.core.password_hasher import password_hasher
 from app.models.user import User
 from app.models.user_progress import UserProgress
 from app.models.prize import Prize
 from app.models.test_question import TestQuestion
 from app.models.event_settings import EventSettings
 from app.models.base import Base
+from app.services import analytics, bulk_import
 # Import all models to register them with Base.metadata
 from app.models import *  # noqa: F401, F403
 
@@ -110,7 +111,7 @@ async def seed_admin():
         if not admin:
             admin = User(
                 email="admin@x5.ru",
-                hashed_password=get_password_hash("admin"),
+                hashed_password=await password_hasher.hash("admin"),
                 is_admin=True
             )
             session.add(admin)
@@ -128,11 +129,9 @@ async def seed_questions():
         existing_questions = result.scalars().all()
         
         if not existing_questions:
-            for q_data in DEFAULT_QUESTIONS:
-                question = TestQuestion(**q_data)
-                session.add(question)
+            imported = await bulk_import.upsert_questions(session, DEFAULT_QUESTIONS)
             await session.commit()
-            print(f"✓ {len(DEFAULT_QUESTIONS)} test questions created")
+            print(f"✓ {imported.created} test questions created")
         else:
             print(f"• {len(existing_questions)} questions already exist")
 
@@ -164,15 +163,24 @@ async def seed_prizes():
         existing_prizes = result.scalars().all()
         
         if not existing_prizes:
-            for prize_data in DEFAULT_PRIZES:
-                prize = Prize(**prize_data)
-                session.add(prize)
+            imported = await bulk_import.upsert_prizes(session, DEFAULT_PRIZES)
             await session.commit()
-            print(f"✓ {len(DEFAULT_PRIZES)} prizes created")
+            print(f"✓ {imported.created} prizes created")
         else:
             print(f"• {len(existing_prizes)} prizes already exist")
 
 
+async def seed_analytics():
+    """Create missing dashboard counters; existing ones keep counting.
+
+    Live counters are never reset here (that races running workers);
+    ``python -m app.services.analytics rebuild`` recounts them explicitly.
+    """
+    async with async_session_maker() as session:
+        await analytics.ensure_counters(session)
+        print("✓ Analytics counters created/verified")
+
+
 async def create_tables():
     """Create all tables if they don't exist."""
     async with engine.begin() as conn:
@@ -191,6 +199,9 @@ async def main():
     await seed_questions()
     await seed_event_settings()
     await seed_prizes()
+    await seed_analytics()
+
+    await password_hasher.shutdown()
     
     print("\n✅ Seeding completed!\n")
 
@@ -0,0 +1,270 @@
+"""
+Refresh token revocation.
+
+Refresh tokens rotate: each carries a ``jti`` and the ``fam`` (login
+session) it belongs to, and using it revokes the jti and issues the
+next token of the same family. A revoked jti presented again means the
+token was copied, so its whole family is revoked (reuse detection) --
+unless it comes back within REFRESH_REUSE_GRACE, as when a client
+retries a refresh whose response it lost; that gets the same new pair.
+Logout revokes a family; logout everywhere records a per-user cutoff
+that invalidates every token issued before it.
+
+Revocations are rows of ``revoked_tokens``. Each worker keeps a Bloom
+filter of revoked families and a dict of cutoffs, loaded at
+startup, synced from the table every REVOCATION_SYNC_INTERVAL and
+rebuilt when expired rows are pruned. A valid token is checked without
+a query; only filter hits (revoked sessions and rare false positives)
+are confirmed in the database. Used jtis stay out of the filter: each
+rotation settles them with its unique insert anyway.
+"""
+import asyncio
+import hashlib
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.revoked_token import RevokedToken
+
+# Kinds
+TOKEN = "token"
+FAMILY = "family"
+USER = "user"
+
+# Rows are stamped before their transaction commits; re-read this far
+# back so a sync does not miss one that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Set of strings with no false negatives and ~``error_rate`` false positives.
+
+    Sized for ``capacity`` items; past that the false positive rate
+    grows until the filter is rebuilt.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class TokenRevocations:
+    """Process-local view of ``revoked_tokens``.
+
+    Revocations made by this process are applied at once; those made by
+    other worker processes show up after the next ``sync``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        # user_id -> epoch seconds; tokens issued earlier are revoked
+        self._cutoffs: dict[int, float] = {}
+        self._loaded = False
+        self._synced_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        # Revocations made while a reload is reading the table
+        self._pending: list[tuple[str, str, int, datetime]] | None = None
+        self.checks = 0
+        self.filter_hits = 0
+        self.confirmed = 0
+        self.reuse_detected = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def remember(self, kind: str, key: str, user_id: int, revoked_at: datetime) -> None:
+        if self._pending is not None:
+            self._pending.append((kind, key, user_id, revoked_at))
+        self._apply(self._filter, kind, key, user_id, revoked_at)
+
+    def _apply(self, bloom: BloomFilter, kind: str, key: str, user_id: int, revoked_at: datetime) -> None:
+        if kind == TOKEN:
+            return
+        if kind == USER:
+            cutoff = _timestamp(revoked_at)
+            if cutoff > self._cutoffs.get(user_id, 0.0):
+                self._cutoffs[user_id] = cutoff
+        elif f"{kind}:{key}" not in bloom:
+            bloom.add(f"{kind}:{key}")
+
+    def revoked_before(self, user_id: int, issued_at: float | None) -> bool:
+        """Whether a token issued at ``issued_at`` predates the user's logout everywhere."""
+        cutoff = self._cutoffs.get(user_id)
+        return cutoff is not None and (issued_at or 0.0) < cutoff
+
+    async def is_revoked(self, db: AsyncSession, kind: str, key: str) -> bool:
+        """Filter check; the database is only asked when the filter says maybe."""
+        self.checks += 1
+        if f"{kind}:{key}" not in self._filter:
+            return False
+        self.filter_hits += 1
+        result = await db.execute(
+            select(RevokedToken.id).where(RevokedToken.kind == kind, RevokedToken.key == key)
+        )
+        revoked = result.scalar_one_or_none() is not None
+        if revoked:
+            self.confirmed += 1
+        return revoked
+
+    async def revoke(
+        self,
+        db: AsyncSession,
+        kind: str,
+        key: str,
+        user_id: int,
+        expires_at: datetime,
+        revoked_at: datetime | None = None,
+        successor: str | None = None
+    ) -> bool:
+        """Record a revocation in the caller's transaction; False if it already existed.
+
+        Applied to this process at once: if the transaction is rolled
+        back, a filter entry is only a false positive.
+        """
+        revoked_at = revoked_at or datetime.utcnow()
+        try:
+            async with db.begin_nested():
+                db.add(RevokedToken(
+                    kind=kind, key=key, user_id=user_id, revoked_at=revoked_at, expires_at=expires_at,
+                    successor=successor
+                ))
+        except IntegrityError:
+            return False
+        self.remember(kind, key, user_id, revoked_at)
+        return True
+
+    async def rotation(self, db: AsyncSession, jti: str) -> tuple[str, datetime] | None:
+        """Successor jti of a used refresh token and when it was issued."""
+        result = await db.execute(
+            select(RevokedToken.successor, RevokedToken.revoked_at)
+            .where(RevokedToken.kind == TOKEN, RevokedToken.key == jti)
+        )
+        row = result.one_or_none()
+        if row is None or row.successor is None:
+            return None
+        return row.successor, row.revoked_at
+
+    async def reload(self, force: bool = True) -> None:
+        """Rebuild the filter and cutoffs from the unexpired rows (one indexed read).
+
+        With ``force=False`` nothing is read if the filter got loaded while
+        waiting for the lock, so concurrent first requests share one load.
+        """
+        async with self._lock:
+            if not force and self._loaded:
+                return
+            self._pending = []
+            try:
+                started_at = datetime.utcnow()
+                async with async_session_maker() as db:
+                    result = await db.execute(
+                        select(RevokedToken.kind, RevokedToken.key, RevokedToken.user_id, RevokedToken.revoked_at)
+                        .where(RevokedToken.expires_at > started_at, RevokedToken.kind != TOKEN)
+                    )
+                    rows = result.all()
+
+                bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+                self._cutoffs = {}
+                for row in [*rows, *self._pending]:
+                    self._apply(bloom, *row)
+                self._filter = bloom
+                self._synced_at = started_at
+                self._loaded = True
+            finally:
+                self._pending = None
+
+    async def ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.reload(force=False)
+
+    async def sync(self) -> None:
+        """Add rows revoked since the last sync, e.g. by other workers."""
+        if self._synced_at is None:
+            await self.reload()
+            return
+        started_at = datetime.utcnow()
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(RevokedToken.kind, RevokedToken.key, RevokedToken.user_id, RevokedToken.revoked_at)
+                .where(RevokedToken.revoked_at >= self._synced_at - SYNC_OVERLAP, RevokedToken.kind != TOKEN)
+            )
+            rows = result.all()
+        for row in rows:
+            self._apply(self._filter, *row)
+        self._synced_at = started_at
+
+    async def prune(self) -> int:
+        """Delete revocations of tokens that have expired anyway, then rebuild."""
+        async with async_session_maker() as db:
+            result = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+            await db.commit()
+        await self.reload()
+        return result.rowcount
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._loaded,
+            "filter_items": self._filter.count,
+            "filter_bits": self._filter.size,
+            "filter_hashes": self._filter.hashes,
+            "user_cutoffs": len(self._cutoffs),
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "confirmed": self.confirmed,
+            "reuse_detected": self.reuse_detected,
+        }
+
+
+revocations = TokenRevocations(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
+
+
+async def sync_periodically() -> None:
+    """Load revocations at startup, then follow other workers and prune expired rows."""
+    pruned_at = time.monotonic()
+    while True:
+        try:
+            if not revocations.loaded:
+                await revocations.reload()
+            elif time.monotonic() - pruned_at >= settings.REVOCATION_PRUNE_INTERVAL:
+                pruned_at = time.monotonic()
+                await revocations.prune()
+            else:
+                await revocations.sync()
+        except Exception:
+            # Database hiccup: keep serving the current filter, retry next tick
+            pass
+        await asyncio.sleep(settings.REVOCATION_SYNC_INTERVAL)
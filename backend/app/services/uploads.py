@@ -0,0 +1,69 @@
+import os
+import time
+from pathlib import Path
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+
+# Bytes read from the upload and written to disk per step
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_SIZE."""
+
+
+class StagedUpload:
+    """An upload written to a temporary file next to its final path.
+
+    ``commit`` moves it into place with an atomic rename; ``discard``
+    removes whatever is left. Readers never see a partial file.
+    """
+
+    def __init__(self, temp_path: Path, final_path: Path, size: int):
+        self.temp_path = temp_path
+        self.final_path = final_path
+        self.size = size
+
+    def commit(self) -> None:
+        os.replace(self.temp_path, self.final_path)
+
+    def discard(self) -> None:
+        for path in (self.temp_path, self.final_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+async def stage_upload(upload: UploadFile, final_path: Path) -> StagedUpload:
+    """Copy an upload to a temp file in chunks without blocking the loop.
+
+    Stops and cleans up as soon as the size passes MAX_UPLOAD_SIZE.
+    """
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = final_path.with_name(f".{final_path.name}.part")
+    size = 0
+    started = time.perf_counter()
+
+    file = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                raise UploadTooLarge()
+            await run_in_threadpool(file.write, chunk)
+        await run_in_threadpool(file.flush)
+        await run_in_threadpool(os.fsync, file.fileno())
+    except BaseException:
+        await run_in_threadpool(file.close)
+        temp_path.unlink(missing_ok=True)
+        raise
+    await run_in_threadpool(file.close)
+
+    metrics.upload_duration_seconds.observe(time.perf_counter() - started)
+    metrics.upload_bytes.observe(size)
+    return StagedUpload(temp_path, final_path, size)
@@ -0,0 +1,230 @@
+"""
+Serialization benchmark for the admin list endpoints.
+
+Loads a fresh SQLite database with --rows users, applications, prizes
+and test questions, fetches each list once, then times only turning the
+rows into a response body:
+
+  default  - what the handlers used to do: return ORM objects or freshly
+             built models and let FastAPI validate them against
+             ``response_model``, run ``jsonable_encoder`` and ``json.dumps``
+  fast     - what they do now: validate the rows once through a
+             TypeAdapter and let pydantic-core write the JSON
+             (app.core.responses.json_response)
+
+Both bodies are decoded and compared before timing.
+
+    python scripts/bench_serialization.py --rows 500 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def populate(db, rows: int) -> None:
+    from app.models.application import Application
+    from app.models.prize import Prize
+    from app.models.test_question import TestQuestion
+    from app.models.user import User
+
+    started = datetime.utcnow() - timedelta(hours=1)
+    users = [
+        User(email=f"student{i}@example.com", hashed_password="x", created_at=started + timedelta(seconds=i))
+        for i in range(rows)
+    ]
+    db.add_all(users)
+    await db.flush()
+    db.add_all(
+        Application(
+            user_id=user.id,
+            full_name=f"Student Number {user.id}",
+            email=user.email,
+            phone="+7 900 000-00-00",
+            direction="developer" if user.id % 2 else "designer",
+            motivation="Хочу работать в X5 Tech над высоконагруженными сервисами " * 3,
+            resume_path=f"uploads/{user.id}_resume.pdf",
+            created_at=user.created_at,
+        )
+        for user in users
+    )
+    db.add_all(
+        Prize(name=f"Приз {i}", points=10 + i, quantity=100, description="Описание приза " * 5)
+        for i in range(rows)
+    )
+    db.add_all(
+        TestQuestion(
+            question=f"Вопрос {i}?",
+            options=[
+                {"text": "Решение сложных логических задач", "type": "developer"},
+                {"text": "Создание красивых и удобных интерфейсов", "type": "designer"},
+            ],
+            order=i,
+        )
+        for i in range(rows)
+    )
+    await db.commit()
+
+
+async def build_cases(db) -> dict:
+    """endpoint -> (default renderer, fast renderer), each returning the body."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from sqlalchemy import select
+
+    from app.api.v1 import admin
+    from app.api.v1.test import question_list_adapter
+    from app.core.responses import json_response
+    from app.main import app
+    from app.models.application import Application
+    from app.models.prize import Prize
+    from app.models.test_question import TestQuestion
+    from app.models.user import User
+    from app.schemas.admin import UserAnalytics
+    from app.schemas.application import ApplicationWithUser
+    from app.schemas.pagination import Page
+    from app.services import prize_stock
+
+    routes = {
+        route.path: route
+        for route in app.routes
+        if hasattr(route, "response_field") and "GET" in route.methods
+    }
+
+    async def default(path: str, content) -> bytes:
+        value = await serialize_response(field=routes[path].secure_cloned_response_field, response_content=content)
+        return JSONResponse(value).body
+
+    # Rows in the shape each version of the handler gets from the database
+    user_rows = (await db.execute(
+        select(User.id, User.email, User.created_at).order_by(User.created_at.desc(), User.id.desc())
+    )).all()
+    application_entities = (await db.execute(
+        select(Application, User.email).join(User, Application.user_id == User.id)
+    )).all()
+    application_rows = (await db.execute(
+        select(*Application.__table__.columns, User.email.label("user_email"))
+        .join(User, Application.user_id == User.id)
+    )).all()
+    prizes = (await db.execute(select(Prize).order_by(Prize.points))).scalars().all()
+    questions = (await db.execute(select(TestQuestion).order_by(TestQuestion.order))).scalars().all()
+
+    async def users_default() -> bytes:
+        page = Page[UserAnalytics](
+            items=[UserAnalytics(email=row.email, registered_at=row.created_at.isoformat()) for row in user_rows]
+        )
+        return await default("/api/v1/admin/users", page)
+
+    async def users_fast() -> bytes:
+        page = admin.user_page_adapter.validate_python({
+            "items": [{"email": row.email, "registered_at": row.created_at.isoformat()} for row in user_rows],
+            "next_cursor": None
+        })
+        return json_response(admin.user_page_adapter, page).body
+
+    async def applications_default() -> bytes:
+        items = [
+            ApplicationWithUser(
+                id=app.id,
+                user_id=app.user_id,
+                full_name=app.full_name,
+                email=app.email,
+                phone=app.phone,
+                direction=app.direction,
+                motivation=app.motivation,
+                resume_path=app.resume_path,
+                created_at=app.created_at,
+                user_email=user_email
+            )
+            for app, user_email in application_entities
+        ]
+        return await default("/api/v1/admin/applications", Page[ApplicationWithUser](items=items))
+
+    async def applications_fast() -> bytes:
+        page = admin.application_page_adapter.validate_python({
+            "items": [row._asdict() for row in application_rows],
+            "next_cursor": None
+        })
+        return json_response(admin.application_page_adapter, page).body
+
+    async def prizes_default() -> bytes:
+        return await default("/api/v1/admin/prizes", prizes)
+
+    async def prizes_fast() -> bytes:
+        adapter = prize_stock.prize_list_adapter
+        return adapter.dump_json(adapter.validate_python(prizes, from_attributes=True))
+
+    async def questions_default() -> bytes:
+        return await default("/api/v1/admin/questions", questions)
+
+    async def questions_fast() -> bytes:
+        adapter = question_list_adapter
+        return adapter.dump_json(adapter.validate_python(questions, from_attributes=True))
+
+    return {
+        "GET /admin/users": (users_default, users_fast),
+        "GET /admin/applications": (applications_default, applications_fast),
+        "GET /admin/prizes": (prizes_default, prizes_fast),
+        "GET /admin/questions": (questions_default, questions_fast),
+    }
+
+
+async def timed(render, repeat: int) -> float:
+    """Best-of-3 mean milliseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await render()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+async def run(args) -> int:
+    from app.core.database import async_session_maker, engine
+    from app.models.base import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_session_maker() as db:
+        await populate(db, args.rows)
+        cases = await build_cases(db)
+
+        print(f"{args.rows} rows, {args.repeat} renders per round, best of 3")
+        print(f"{'endpoint':<26}{'default ms':>12}{'fast ms':>10}{'speedup':>10}")
+        for name, (default, fast) in cases.items():
+            if json.loads(await default()) != json.loads(await fast()):
+                print(f"{name}: bodies differ")
+                return 1
+            default_ms = await timed(default, args.repeat)
+            fast_ms = await timed(fast, args.repeat)
+            print(f"{name:<26}{default_ms:>12.2f}{fast_ms:>10.2f}{default_ms / fast_ms:>9.1f}x")
+
+    await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="rows per list (default 500, the ADMIN_PAGE_SIZE_MAX page)")
+    parser.add_argument("--repeat", type=int, default=200, help="renders per timing round")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="x5-bench-"))
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir / 'bench.sqlite'}"
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    os.environ["SQL_ECHO"] = "false"
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Point the app at a throwaway SQLite database before anything imports it."""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.sqlite"
@@ -0,0 +1,97 @@
+"""Concurrent reward paths: once-only awards are granted exactly once."""
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base, PointsLedgerEntry, User, UserProgress
+from app.services import points_ledger
+from app.services import progress as progress_service
+
+CONCURRENCY = 20
+POINTS = 50
+
+
+async def _database(path, with_progress: bool = True):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        user = User(email="student@x5.ru", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        if with_progress:
+            db.add(UserProgress(user_id=user.id))
+        await db.commit()
+    return engine, session_maker, user.id
+
+
+async def _award_concurrently(session_maker, user_id: int, once) -> list[int | None]:
+    async def award() -> int | None:
+        async with session_maker() as db:
+            total = await progress_service.award(
+                db, user_id, POINTS, points_ledger.GAME_COMPLETED, once=once
+            )
+            await db.commit()
+            return total
+
+    return await asyncio.gather(*(award() for _ in range(CONCURRENCY)))
+
+
+async def _state(session_maker, user_id: int) -> tuple[list[int], int]:
+    async with session_maker() as db:
+        balances = (await db.execute(
+            select(UserProgress.points).where(UserProgress.user_id == user_id)
+        )).scalars().all()
+        ledger_rows = (await db.execute(
+            select(func.count()).select_from(PointsLedgerEntry).where(PointsLedgerEntry.user_id == user_id)
+        )).scalar_one()
+    return list(balances), ledger_rows
+
+
+def test_concurrent_once_award_is_granted_once(tmp_path):
+    async def scenario():
+        engine, session_maker, user_id = await _database(tmp_path / "db.sqlite")
+        try:
+            totals = await _award_concurrently(session_maker, user_id, UserProgress.completed_game)
+            return totals, await _state(session_maker, user_id)
+        finally:
+            await engine.dispose()
+
+    totals, (balances, ledger_rows) = asyncio.run(scenario())
+    assert [total for total in totals if total is not None] == [POINTS]
+    assert balances == [POINTS]
+    assert ledger_rows == 1
+
+
+def test_concurrent_once_award_creates_missing_progress_once(tmp_path):
+    async def scenario():
+        engine, session_maker, user_id = await _database(tmp_path / "db.sqlite", with_progress=False)
+        try:
+            totals = await _award_concurrently(session_maker, user_id, UserProgress.completed_test)
+            return totals, await _state(session_maker, user_id)
+        finally:
+            await engine.dispose()
+
+    totals, (balances, ledger_rows) = asyncio.run(scenario())
+    assert [total for total in totals if total is not None] == [POINTS]
+    assert balances == [POINTS]
+    assert ledger_rows == 1
+
+
+def test_concurrent_repeatable_awards_all_count(tmp_path):
+    async def scenario():
+        engine, session_maker, user_id = await _database(tmp_path / "db.sqlite")
+        try:
+            totals = await _award_concurrently(session_maker, user_id, None)
+            return totals, await _state(session_maker, user_id)
+        finally:
+            await engine.dispose()
+
+    totals, (balances, ledger_rows) = asyncio.run(scenario())
+    # Every award saw its own balance: no lost updates
+    assert sorted(totals) == [POINTS * n for n in range(1, CONCURRENCY + 1)]
+    assert balances == [POINTS * CONCURRENCY]
+    assert ledger_rows == CONCURRENCY
@@ -0,0 +1,45 @@
+"""Query budgets of hot endpoints, counted on the app's own engine."""
+import asyncio
+
+import httpx
+
+from app.core.database import async_session_maker, engine
+from app.core.security import create_tokens
+from app.core.sql_profiler import assert_max_queries
+from app.main import app
+from app.models import Base, User, UserProgress
+from app.services.token_revocation import revocations
+
+
+async def _student_headers() -> dict[str, str]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as db:
+        user = User(email="budget@x5.ru", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        db.add(UserProgress(user_id=user.id))
+        await db.commit()
+    # Loaded once per worker at startup; not part of a request's budget
+    await revocations.reload()
+    return {"Authorization": f"Bearer {create_tokens(user.id)['access_token']}"}
+
+
+def test_users_me_query_budget():
+    async def scenario():
+        try:
+            headers = await _student_headers()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                with assert_max_queries(3, engine) as queries:
+                    response = await client.get("/api/v1/users/me", headers=headers)
+            return response, queries
+        finally:
+            await engine.dispose()
+
+    response, queries = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "budget@x5.ru"
+    # The helper counts for real: principal, user and progress
+    assert queries.count > 0, "engine not counted"
@@ -18,6 +18,7 @@ export const setTokens = (access, refresh) => {
 export const clearTokens = () => {
   accessToken = null
   refreshToken = null
+  clearBootstrapCache()
   localStorage.removeItem('accessToken')
   localStorage.removeItem('refreshToken')
 }
@@ -61,8 +62,48 @@ const fetchWithAuth = async (url, options = {}) => {
   return response
 }
 
-// Обновление access токена
-const refreshAccessToken = async () => {
+// Ключ для Idempotency-Key (randomUUID есть только в secure context)
+const newIdempotencyKey = () =>
+  crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+
+// Запрос, меняющий состояние, с Idempotency-Key: повтор после сетевой
+// ошибки безопасен — сервер вернёт ответ первой попытки, а не выполнит
+// действие ещё раз
+const fetchIdempotent = async (url, options = {}, retries = 2) => {
+  const headers = { ...options.headers, 'Idempotency-Key': newIdempotencyKey() }
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await fetchWithAuth(url, { ...options, headers })
+    } catch (error) {
+      if (attempt >= retries) throw error
+      await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)))
+    }
+  }
+}
+
+// Обновление access токена. Refresh токен одноразовый (ротация), поэтому
+// параллельные запросы ждут одно обновление, а если другая вкладка уже
+// обновила токены, берём их из localStorage вместо повторного использования
+// старого (сервер счёл бы это кражей и завершил сессию)
+let refreshPromise = null
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    refreshPromise = doRefresh().finally(() => {
+      refreshPromise = null
+    })
+  }
+  return refreshPromise
+}
+
+const doRefresh = async () => {
+  const storedRefreshToken = localStorage.getItem('refreshToken')
+  if (storedRefreshToken && storedRefreshToken !== refreshToken) {
+    accessToken = localStorage.getItem('accessToken')
+    refreshToken = storedRefreshToken
+    return true
+  }
+
   try {
     const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
       method: 'POST',
@@ -86,6 +127,35 @@ const refreshAccessToken = async () => {
   }
 }
 
+// Одна страница списка с курсорной пагинацией: { items, next_cursor }
+const fetchPage = async (url, cursor, errorMessage, limit = null) => {
+  const params = new URLSearchParams()
+  if (cursor) params.set('cursor', cursor)
+  if (limit) params.set('limit', limit)
+  const query = params.toString()
+  const response = await fetchWithAuth(query ? `${url}?${query}` : url)
+
+  if (!response.ok) {
+    throw new Error(errorMessage)
+  }
+
+  return response.json()
+}
+
+// Все страницы списка — только для выгрузки по запросу, не для отображения
+const fetchAllPages = async (url, errorMessage) => {
+  const items = []
+  let cursor = null
+
+  do {
+    const page = await fetchPage(url, cursor, errorMessage, 500)
+    items.push(...page.items)
+    cursor = page.next_cursor
+  } while (cursor)
+
+  return items
+}
+
 // ==================== AUTH API ====================
 
 export const authApi = {
@@ -125,8 +195,15 @@ export const authApi = {
     return data
   },
 
-  // Выход
+  // Выход: сервер отзывает сессию refresh токена
   logout() {
+    if (refreshToken) {
+      fetch(`${API_BASE_URL}/auth/logout`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => {})
+    }
     clearTokens()
   },
 }
@@ -168,6 +245,48 @@ export const userApi = {
   },
 }
 
+// ==================== BOOTSTRAP API ====================
+
+// Секции /bootstrap, уже полученные в этой сессии: имя -> { etag, data }
+let bootstrapSections = {}
+
+const clearBootstrapCache = () => {
+  bootstrapSections = {}
+}
+
+export const bootstrapApi = {
+  // Все данные для запуска приложения одним запросом.
+  // Неизменившиеся секции сервер не присылает (по ETag из If-None-Match).
+  async get() {
+    const etags = Object.values(bootstrapSections).map((section) => section.etag)
+    const response = await fetchWithAuth('/bootstrap', {
+      headers: etags.length ? { 'If-None-Match': etags.join(', ') } : {},
+    })
+
+    const result = {}
+    // Ничего не изменилось: все секции уже есть
+    if (response.status === 304) {
+      for (const [name, section] of Object.entries(bootstrapSections)) {
+        result[name] = section.data
+      }
+      return result
+    }
+
+    if (!response.ok) {
+      throw new Error('Не удалось загрузить данные')
+    }
+
+    const sections = await response.json()
+    for (const [name, section] of Object.entries(sections)) {
+      if (!section.not_modified) {
+        bootstrapSections[name] = { etag: section.etag, data: section.data }
+      }
+      result[name] = bootstrapSections[name].data
+    }
+    return result
+  },
+}
+
 // ==================== TEST API ====================
 
 export const testApi = {
@@ -184,7 +303,7 @@ export const testApi = {
 
   // Завершить тест
   async complete(result) {
-    const response = await fetchWithAuth('/test/complete', {
+    const response = await fetchIdempotent('/test/complete', {
       method: 'POST',
       body: JSON.stringify({ result }),
     })
@@ -232,7 +351,7 @@ export const testApi = {
 export const gameApi = {
   // Завершить игру
   async complete(gameType, score) {
-    const response = await fetchWithAuth('/games/complete', {
+    const response = await fetchIdempotent('/games/complete', {
       method: 'POST',
       body: JSON.stringify({ game_type: gameType, score }),
     })
@@ -262,7 +381,7 @@ export const prizesApi = {
 
   // Получить приз
   async claim(prizeId) {
-    const response = await fetchWithAuth(`/prizes/${prizeId}/claim`, {
+    const response = await fetchIdempotent(`/prizes/${prizeId}/claim`, {
       method: 'POST',
     })
     
@@ -280,7 +399,7 @@ export const prizesApi = {
 export const applicationsApi = {
   // Отправить заявку
   async submit(formData) {
-    const response = await fetchWithAuth('/applications', {
+    const response = await fetchIdempotent('/applications', {
       method: 'POST',
       body: formData, // FormData для multipart/form-data
     })
@@ -323,26 +442,67 @@ export const adminApi = {
     return response.json()
   },
 
-  // Получить все заявки
-  async getApplications() {
-    const response = await fetchWithAuth('/admin/applications')
-    
-    if (!response.ok) {
-      throw new Error('Не удалось загрузить заявки')
-    }
-    
-    return response.json()
+  // Получить страницу заявок (next_cursor — для «Загрузить ещё»)
+  async getApplications(cursor = null) {
+    return fetchPage('/admin/applications', cursor, 'Не удалось загрузить заявки')
   },
 
-  // Получить всех пользователей
-  async getUsers() {
-    const response = await fetchWithAuth('/admin/users')
-    
-    if (!response.ok) {
-      throw new Error('Не удалось загрузить пользователей')
+  // Получить все заявки (для экспорта)
+  async getAllApplications() {
+    return fetchAllPages('/admin/applications', 'Не удалось загрузить заявки')
+  },
+
+  // Получить страницу пользователей
+  async getUsers(cursor = null) {
+    return fetchPage('/admin/users', cursor, 'Не удалось загрузить пользователей')
+  },
+
+  // Получить всех пользователей (для экспорта)
+  async getAllUsers() {
+    return fetchAllPages('/admin/users', 'Не удалось загрузить пользователей')
+  },
+
+  // Живые обновления дашборда (SSE). EventSource не умеет передавать
+  // заголовок Authorization, поэтому поток читается через fetch.
+  // Переподключается с Last-Event-ID, пока не отменён signal.
+  async streamEvents(onEvent, signal) {
+    let lastEventId = null
+
+    while (!signal.aborted) {
+      try {
+        const headers = lastEventId ? { 'Last-Event-ID': lastEventId } : {}
+        const response = await fetchWithAuth('/admin/stream', { headers, signal })
+        if (!response.ok) {
+          throw new Error('Не удалось подключиться к потоку событий')
+        }
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+        let buffer = ''
+        for (;;) {
+          const { value, done } = await reader.read()
+          if (done) break
+          buffer += value
+          let separator
+          while ((separator = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, separator)
+            buffer = buffer.slice(separator + 2)
+            let event = 'message'
+            const data = []
+            for (const line of block.split('\n')) {
+              if (line.startsWith('event: ')) event = line.slice(7)
+              else if (line.startsWith('id: ')) lastEventId = line.slice(4)
+              else if (line.startsWith('data: ')) data.push(line.slice(6))
+            }
+            if (data.length) onEvent(event, JSON.parse(data.join('\n')))
+          }
+        }
+      } catch (error) {
+        if (signal.aborted) return
+        console.error('Поток событий прерван:', error)
+      }
+      // Пауза перед переподключением
+      await new Promise((resolve) => setTimeout(resolve, 3000))
     }
-    
-    return response.json()
   },
 
   // Управление призами
@@ -4,6 +4,7 @@ import { motion } from 'framer-motion'
 import * as XLSX from 'xlsx'
 import { useUserStore } from '../../stores/userStore'
 import { useAdminStore } from '../../stores/adminStore'
+import { adminApi } from '../../api/api'
 import Card from '../../components/ui/Card'
 import Button from '../../components/ui/Button'
 import Input from '../../components/ui/Input'
@@ -27,6 +28,9 @@ function AdminDashboard() {
     fetchTestQuestions,
     fetchAnalytics,
     fetchUsers,
+    loadMoreUsers,
+    loadMoreApplications,
+    applyLiveEvent,
     analytics,
     users,
     testQuestions,
@@ -34,6 +38,8 @@ function AdminDashboard() {
     updateQuestion,
     removeQuestion,
     applications,
+    usersCursor,
+    applicationsCursor,
     loading,
   } = useAdminStore()
 
@@ -72,12 +78,22 @@ function AdminDashboard() {
     loadData()
   }, [fetchPrizes, fetchEventSettings, fetchApplications, fetchTestQuestions, fetchAnalytics, fetchUsers])
 
+  // Живые обновления аналитики, пользователей и заявок вместо повторных запросов
+  useEffect(() => {
+    if (!isInitialized) return
+    const controller = new AbortController()
+    adminApi.streamEvents(applyLiveEvent, controller.signal)
+    return () => controller.abort()
+  }, [isInitialized, applyLiveEvent])
+
   const handleLogout = () => {
     logout()
     navigate('/')
   }
 
-  const handleExportExcel = () => {
+  const handleExportExcel = async () => {
+    // В дашборде только загруженные страницы; для выгрузки берём всех
+    const allUsers = await adminApi.getAllUsers()
     const wb = XLSX.utils.book_new()
     
     // Summary sheet
@@ -91,8 +107,8 @@ function AdminDashboard() {
     XLSX.utils.book_append_sheet(wb, summaryWs, 'Сводка')
     
     // Users sheet
-    if (users && users.length > 0) {
-      const usersData = users.map((user, index) => ({
+    if (allUsers.length > 0) {
+      const usersData = allUsers.map((user, index) => ({
         '№': index + 1,
         'Email': user.email,
         'Дата регистрации': new Date(user.registered_at).toLocaleString('ru-RU'),
@@ -104,12 +120,13 @@ function AdminDashboard() {
     XLSX.writeFile(wb, `x5_analytics_${new Date().toISOString().split('T')[0]}.xlsx`)
   }
 
-  const handleExportApplications = () => {
-    if (applications.length === 0) return
+  const handleExportApplications = async () => {
+    const allApplications = await adminApi.getAllApplications()
+    if (allApplications.length === 0) return
 
     const wb = XLSX.utils.book_new()
     
-    const applicationsData = applications.map((app, index) => ({
+    const applicationsData = allApplications.map((app, index) => ({
       '№': index + 1,
       'ФИО': app.full_name,
       'Email': app.email,
@@ -282,7 +299,7 @@ function AdminDashboard() {
                         </tr>
                       </thead>
                       <tbody>
-                        {users.slice(0, 10).map((user, index) => (
+                        {users.map((user, index) => (
                           <tr key={index}>
                             <td>{user.email}</td>
                             <td>{new Date(user.registered_at).toLocaleString('ru-RU')}</td>
@@ -290,10 +307,12 @@ function AdminDashboard() {
                         ))}
                       </tbody>
                     </table>
-                    {users.length > 10 && (
-                      <p className={styles.moreUsers}>
-                        И ещё {users.length - 10} пользователей...
-                      </p>
+                    {usersCursor && (
+                      <div className={styles.moreUsers}>
+                        <Button variant="secondary" onClick={loadMoreUsers} disabled={loading}>
+                          Загрузить ещё
+                        </Button>
+                      </div>
                     )}
                   </div>
                 </Card>
@@ -310,7 +329,7 @@ function AdminDashboard() {
                 <h2 className={styles.sectionTitle}>Заявки на стажировку</h2>
                 <div className={styles.applicationsActions}>
                   <span className={styles.applicationsCount}>
-                    Всего: {applications.length}
+                    Всего: {analytics?.applications ?? applications.length}
                   </span>
                   {applications.length > 0 && (
                     <Button variant="primary" onClick={handleExportApplications}>
@@ -338,7 +357,7 @@ function AdminDashboard() {
                       key={app.id}
                       initial={{ opacity: 0, y: 20 }}
                       animate={{ opacity: 1, y: 0 }}
-                      transition={{ delay: index * 0.05 }}
+                      transition={{ delay: Math.min(index, 10) * 0.05 }}
                     >
                       <Card variant="default" padding="medium" className={styles.applicationCard}>
                         <div className={styles.applicationHeader}>
@@ -406,6 +425,13 @@ function AdminDashboard() {
                       </Card>
                     </motion.div>
                   ))}
+                  {applicationsCursor && (
+                    <div className={styles.moreUsers}>
+                      <Button variant="secondary" onClick={loadMoreApplications} disabled={loading}>
+                        Загрузить ещё
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </motion.div>
@@ -1,7 +1,6 @@
 import { useState, useEffect } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { useUserStore } from '../../stores/userStore'
-import { prizesApi } from '../../api/api'
 import Card from '../../components/ui/Card'
 import Button from '../../components/ui/Button'
 import ProgressBar from '../../components/ui/ProgressBar'
@@ -12,29 +11,19 @@ import styles from './RewardsPage.module.css'
 const raccoonIcon = 'https://www.figma.com/api/mcp/asset/f7a133a4-fa94-4d0a-8969-4205924e62de'
 
 function RewardsPage() {
-  const { points, claimedPrizes, claimPrize: userClaimPrize, loading } = useUserStore()
-  const [prizes, setPrizes] = useState([])
+  const { points, claimedPrizes, claimPrize: userClaimPrize, prizes, loadPrizes, loading } = useUserStore()
   const [confirmModal, setConfirmModal] = useState({ isOpen: false, prize: null })
   const [successMessage, setSuccessMessage] = useState(null)
   const [isLoading, setIsLoading] = useState(true)
 
-  // Загружаем призы через публичный API при монтировании
-  const loadPrizes = async () => {
-    try {
-      const data = await prizesApi.getAll()
-      setPrizes(data)
-    } catch (error) {
-      console.error('Ошибка загрузки призов:', error)
-    }
-  }
-
+  // Призы уже пришли в /bootstrap; запрос — только если их нет или они устарели
   useEffect(() => {
     const init = async () => {
       await loadPrizes()
       setIsLoading(false)
     }
     init()
-  }, [])
+  }, [loadPrizes])
 
   // Показываем загрузку
   if (isLoading) {
@@ -80,7 +69,7 @@ function RewardsPage() {
       if (success) {
         setSuccessMessage(`Вы получили "${prize.name}"! Подойдите на стойку регистрации для получения.`)
         // Обновляем список призов через публичный API
-        await loadPrizes()
+        await loadPrizes(true)
         setTimeout(() => setSuccessMessage(null), 5000)
       }
     }
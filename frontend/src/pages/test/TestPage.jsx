@@ -3,7 +3,6 @@ import { useNavigate } from 'react-router-dom'
 import { motion, AnimatePresence } from 'framer-motion'
 import { useUserStore } from '../../stores/userStore'
 import { useAdminStore } from '../../stores/adminStore'
-import { testApi } from '../../api/api'
 import Card from '../../components/ui/Card'
 import Button from '../../components/ui/Button'
 import ProgressBar from '../../components/ui/ProgressBar'
@@ -11,34 +10,28 @@ import styles from './TestPage.module.css'
 
 function TestPage() {
   const navigate = useNavigate()
-  const { completedTest, completeTest, skipTest, loading } = useUserStore()
-  const { testQuestions, fetchTestQuestions } = useAdminStore()
+  const { completedTest, completeTest, skipTest, loading, testQuestions: loadedQuestions, loadTestQuestions } = useUserStore()
+  const { testQuestions: defaultQuestions, fetchTestQuestions } = useAdminStore()
+  // Вопросы с сервера, иначе дефолтные из adminStore
+  const testQuestions = loadedQuestions.length > 0 ? loadedQuestions : defaultQuestions
   
   const [currentQuestion, setCurrentQuestion] = useState(0)
   const [answers, setAnswers] = useState([])
   const [selectedOption, setSelectedOption] = useState(null)
   const [isLoading, setIsLoading] = useState(true)
 
-  // Загружаем вопросы при монтировании
+  // Вопросы уже пришли в /bootstrap; запрос — только если их нет или они устарели
   useEffect(() => {
     const loadQuestions = async () => {
-      try {
-        // Пробуем загрузить через API для авторизованного пользователя
-        const questions = await testApi.getQuestions()
-        if (questions.length === 0) {
-          await fetchTestQuestions()
-        } else {
-          // Обновляем store
-          await fetchTestQuestions()
-        }
-      } catch (error) {
+      const questions = await loadTestQuestions()
+      if (questions.length === 0) {
         // Fallback на данные из adminStore
         await fetchTestQuestions()
       }
       setIsLoading(false)
     }
     loadQuestions()
-  }, [fetchTestQuestions])
+  }, [loadTestQuestions, fetchTestQuestions])
 
   // Redirect if already completed
   if (completedTest) {
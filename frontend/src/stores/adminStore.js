@@ -69,6 +69,9 @@ const initialState = {
   testQuestions: [],
   applications: [],
   users: [],
+  // Курсоры следующих страниц (null — загружено всё)
+  applicationsCursor: null,
+  usersCursor: null,
   analytics: null,
   
   // Состояние загрузки
@@ -98,13 +101,13 @@ export const useAdminStore = create((set, get) => ({
     }
   },
 
-  // Загрузить пользователей
+  // Загрузить первую страницу пользователей
   fetchUsers: async () => {
     set({ loading: true, error: null })
     try {
-      const users = await adminApi.getUsers()
-      set({ users, loading: false })
-      return users
+      const page = await adminApi.getUsers()
+      set({ users: page.items, usersCursor: page.next_cursor, loading: false })
+      return page.items
     } catch (error) {
       console.error('Ошибка загрузки пользователей:', error)
       set({ loading: false, error: error.message })
@@ -112,13 +115,35 @@ export const useAdminStore = create((set, get) => ({
     }
   },
 
-  // Загрузить заявки
+  // Догрузить следующую страницу пользователей
+  loadMoreUsers: async () => {
+    const { usersCursor } = get()
+    if (!usersCursor) return []
+    set({ loading: true, error: null })
+    try {
+      const page = await adminApi.getUsers(usersCursor)
+      const { users } = get()
+      const known = new Set(users.map((user) => user.email))
+      set({
+        users: [...users, ...page.items.filter((user) => !known.has(user.email))],
+        usersCursor: page.next_cursor,
+        loading: false,
+      })
+      return page.items
+    } catch (error) {
+      console.error('Ошибка загрузки пользователей:', error)
+      set({ loading: false, error: error.message })
+      return []
+    }
+  },
+
+  // Загрузить первую страницу заявок
   fetchApplications: async () => {
     set({ loading: true, error: null })
     try {
-      const applications = await adminApi.getApplications()
-      set({ applications, loading: false })
-      return applications
+      const page = await adminApi.getApplications()
+      set({ applications: page.items, applicationsCursor: page.next_cursor, loading: false })
+      return page.items
     } catch (error) {
       console.error('Ошибка загрузки заявок:', error)
       set({ loading: false, error: error.message })
@@ -126,6 +151,62 @@ export const useAdminStore = create((set, get) => ({
     }
   },
 
+  // Догрузить следующую страницу заявок
+  loadMoreApplications: async () => {
+    const { applicationsCursor } = get()
+    if (!applicationsCursor) return []
+    set({ loading: true, error: null })
+    try {
+      const page = await adminApi.getApplications(applicationsCursor)
+      const { applications } = get()
+      const known = new Set(applications.map((application) => application.id))
+      set({
+        applications: [...applications, ...page.items.filter((application) => !known.has(application.id))],
+        applicationsCursor: page.next_cursor,
+        loading: false,
+      })
+      return page.items
+    } catch (error) {
+      console.error('Ошибка загрузки заявок:', error)
+      set({ loading: false, error: error.message })
+      return []
+    }
+  },
+
+  // Применить событие из живого потока /admin/stream
+  applyLiveEvent: (event, data) => {
+    const { analytics, users, applications } = get()
+    switch (event) {
+      case 'snapshot':
+        set({ analytics: data.analytics })
+        break
+      case 'analytics_totals':
+        set({ analytics: data })
+        break
+      case 'analytics':
+        if (analytics) {
+          const updated = { ...analytics }
+          for (const [name, delta] of Object.entries(data)) {
+            updated[name] = (updated[name] || 0) + delta
+          }
+          set({ analytics: updated })
+        }
+        break
+      case 'user':
+        if (!users.some((user) => user.email === data.email)) {
+          set({ users: [{ email: data.email, registered_at: data.registered_at }, ...users] })
+        }
+        break
+      case 'application':
+        if (!applications.some((application) => application.id === data.id)) {
+          set({ applications: [data, ...applications] })
+        }
+        break
+      default:
+        break
+    }
+  },
+
   // Загрузить призы
   fetchPrizes: async () => {
     set({ loading: true, error: null })
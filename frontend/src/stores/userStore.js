@@ -2,6 +2,7 @@ import { create } from 'zustand'
 import { persist } from 'zustand/middleware'
 import { 
   authApi, 
+  bootstrapApi,
   userApi, 
   testApi, 
   gameApi, 
@@ -12,6 +13,9 @@ import {
   getAccessToken 
 } from '../api/api'
 
+// Сколько каталог призов и вопросов из /bootstrap считается свежим, мс
+const CATALOG_MAX_AGE = 60 * 1000
+
 const initialState = {
   user: null,
   isAuthenticated: false,
@@ -23,6 +27,10 @@ const initialState = {
   appliedForInternship: false,
   resumeFileName: null,
   claimedPrizes: [], // список ID полученных призов
+  // Каталог из /bootstrap: не запрашиваем повторно, пока он свежий
+  prizes: [],
+  testQuestions: [],
+  catalogLoadedAt: 0,
   loading: false,
   error: null,
 }
@@ -42,9 +50,15 @@ export const useUserStore = create(
 
         set({ loading: true, error: null })
         try {
-          const userData = await userApi.getMe()
+          // Профиль, призы, заявка и каталог одним запросом
+          const {
+            user: userData,
+            claimed_prizes: claimedPrizes,
+            application,
+            prizes,
+            test_questions: testQuestions,
+          } = await bootstrapApi.get()
           const progress = userData.progress || {}
-          const claimedPrizes = await userApi.getClaimedPrizes()
           
           set({
             user: { email: userData.email, id: userData.id },
@@ -55,11 +69,13 @@ export const useUserStore = create(
             testResult: progress.test_result || null,
             completedGame: progress.completed_game || false,
             claimedPrizes: claimedPrizes.map(cp => cp.prize_id),
+            prizes,
+            testQuestions,
+            catalogLoadedAt: Date.now(),
             loading: false,
           })
 
           // Проверяем заявку
-          const application = await applicationsApi.getMy()
           if (application) {
             set({
               appliedForInternship: true,
@@ -159,11 +175,45 @@ export const useUserStore = create(
         }
       },
 
+      // Призы: из /bootstrap, запрос — только если их нет или они устарели
+      // (force — после получения приза, когда остатки изменились)
+      loadPrizes: async (force = false) => {
+        const { prizes, catalogLoadedAt } = get()
+        if (!force && prizes.length > 0 && Date.now() - catalogLoadedAt < CATALOG_MAX_AGE) {
+          return prizes
+        }
+        try {
+          const fresh = await prizesApi.getAll()
+          set({ prizes: fresh })
+          return fresh
+        } catch (error) {
+          console.error('Ошибка загрузки призов:', error)
+          return prizes
+        }
+      },
+
       hasClaimedPrize: (prizeId) => {
         return get().claimedPrizes.includes(prizeId)
       },
 
       // Test actions
+
+      // Вопросы: из /bootstrap, запрос — только если их нет или они устарели
+      loadTestQuestions: async () => {
+        const { testQuestions, catalogLoadedAt } = get()
+        if (testQuestions.length > 0 && Date.now() - catalogLoadedAt < CATALOG_MAX_AGE) {
+          return testQuestions
+        }
+        try {
+          const fresh = await testApi.getQuestions()
+          set({ testQuestions: fresh })
+          return fresh
+        } catch (error) {
+          console.error('Ошибка загрузки вопросов:', error)
+          return testQuestions
+        }
+      },
+
       completeTest: async (result) => {
         set({ loading: true, error: null })
         try {